@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of converting array.array values without numpy
+
+convert() on a whole array.array (one pass, with the factors folded),
+compared to a list comprehension calling convert() for each value -- the
+way to do it without numpy before. Also the lat-long ToDegMinArray on an
+array.array, compared to calling ToDegMin for each value.
+
+numpy is not used (or imported).
+
+run with:
+
+python bench_buffer_conversion.py [number_of_values]
+"""
+
+import sys, os, time, array, random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hazpy.unit_conversion import convert, LatLongConverter
+
+
+def report(name, buffer_time, scalar_time):
+    print("%-28s buffer: %7.1f ms  scalar: %7.1f ms  (%.1fx)" %
+          (name, buffer_time * 1000, scalar_time * 1000, scalar_time / buffer_time))
+
+
+def timed(function, *args):
+    start = time.time()
+    result = function(*args)
+    return result, time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    values = array.array("d", (random.uniform(-90.0, 90.0) for i in range(count)))
+    print("%i values" % count)
+
+    for args in [("Length", "meter", "foot"),
+                 ("Temperature", "C", "F"),
+                 ("Density", "API", "kg/m^3")]:
+        unit_type, from_unit, to_unit = args
+        result, buffer_time = timed(convert, unit_type, from_unit, to_unit, values)
+        expected, scalar_time = timed(lambda: [convert(unit_type, from_unit, to_unit, value)
+                                               for value in values])
+        assert result.tolist() == expected
+        report("%s: %s -> %s" % args, buffer_time, scalar_time)
+
+    result, buffer_time = timed(LatLongConverter.ToDegMinArray, values)
+    expected, scalar_time = timed(lambda: [LatLongConverter.ToDegMin(value) for value in values])
+    assert zip(*result) == expected
+    report("ToDegMin", buffer_time, scalar_time)
+
+    assert "numpy" not in sys.modules
+
+
+if __name__ == "__main__":
+    main()
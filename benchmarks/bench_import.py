@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the import (cold start) time of hazpy.unit_conversion
+
+Each measurement is done in a fresh interpreter, timed from inside, so the
+interpreter start-up itself is not included.
+
+The "eager" numbers emulate what used to happen at import: unit_data
+was reloaded, and all the converter objects were built. (numpy was
+never imported by the old package, so it isn't here either.)
+
+run with:
+
+python bench_import.py [number_of_runs]
+"""
+
+import sys, os, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = """
+import sys, time
+sys.path.insert(0, %r)
+%s
+start = time.time()
+%s
+print(time.time() - start)
+"""
+
+# (name, setup -- not timed, code)
+CASES = [("import hazpy (namespace package only)", "",
+          "import hazpy"),
+         ("import hazpy.unit_conversion", "",
+          "import hazpy.unit_conversion"),
+         ("  the same, hazpy already imported", "import hazpy",
+          "import hazpy.unit_conversion"),
+         ("import + first scalar convert()", "import hazpy",
+          "import hazpy.unit_conversion as uc; uc.convert('Length', 'ft', 'm', 1.0)"),
+         ("eager: import + reload + all converters", "import hazpy",
+          "import hazpy.unit_conversion as uc; from hazpy.unit_conversion import unit_data; "
+          "reload(unit_data); uc.Converters.load_all()"),
+         ]
+
+
+def time_import(setup, code, runs):
+    times = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", TIMER % (ROOT, setup, code)])
+        times.append(float(output))
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+    print("median of %i runs:" % runs)
+    for name, setup, code in CASES:
+        print("  %-42s %8.1f ms" % (name, time_import(setup, code, runs) * 1000))
+
+
+if __name__ == "__main__":
+    main()
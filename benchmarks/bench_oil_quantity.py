@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of OilQuantityConverter on arrays
+
+converts a mass ensemble (with a density for each member) to volume,
+compared to calling ToVolume for each member.
+
+run with:
+
+python bench_oil_quantity.py [ensemble_size]
+"""
+
+import sys, os, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from hazpy.unit_conversion import OilQuantityConverter
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    random = np.random.RandomState(0)
+    mass = random.uniform(1.0, 1000.0, size)
+    density = random.uniform(10.0, 40.0, size)
+
+    start = time.time()
+    volume = OilQuantityConverter.ToVolume(mass, "metric ton", density, "API", "bbl")
+    array_time = time.time() - start
+    print("ToVolume, %i element arrays:    %8.1f ms" % (size, array_time * 1000))
+
+    loop_size = min(size, 100000)
+    start = time.time()
+    for m, d in zip(mass[:loop_size].tolist(), density[:loop_size].tolist()):
+        OilQuantityConverter.ToVolume(m, "metric ton", d, "API", "bbl")
+    loop_time = (time.time() - start) * size / loop_size
+    print("ToVolume, one at a time (scaled): %8.1f ms" % (loop_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of geodesy.polygon_area on a batch of polygons
+
+slick outlines are simulated by irregular polygons of 20 to 200 vertices
+around random points in the Gulf of Mexico, all computed in one call,
+compared to calling polygon_area for each one.
+
+run with:
+
+python bench_polygon_area.py [number_of_polygons]
+"""
+
+import sys, os, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from hazpy.unit_conversion import geodesy
+
+
+def make_polygons(count, random):
+    sizes = random.randint(20, 200, count)
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    polygon = np.repeat(np.arange(count), sizes)
+    angle = np.concatenate([np.linspace(0, 2 * np.pi, size, endpoint=False) for size in sizes])
+    radius = random.uniform(0.01, 0.2, count)[polygon] * random.uniform(0.7, 1.0, len(angle))
+    lats = random.uniform(25.0, 30.0, count)[polygon] + radius * np.sin(angle)
+    lons = random.uniform(-97.0, -83.0, count)[polygon] + radius * np.cos(angle)
+    return lats, lons, offsets
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random = np.random.RandomState(0)
+    lats, lons, offsets = make_polygons(count, random)
+
+    start = time.time()
+    areas = geodesy.polygon_area(lats, lons, offsets, unit="sq km")
+    batch_time = time.time() - start
+    print("%i polygons, %i vertices" % (count, len(lats)))
+    print("one batch:    %8.1f ms  %10.0f polygons/s" % (batch_time * 1000, count / batch_time))
+
+    loop_count = min(count, 10000)
+    ends = np.append(offsets[1:], len(lats))
+    start = time.time()
+    for first, last in zip(offsets[:loop_count], ends[:loop_count]):
+        geodesy.polygon_area(lats[first:last], lons[first:last], unit="sq km")
+    loop_time = time.time() - start
+    print("one at a time: %7.1f ms  %10.0f polygons/s" % (loop_time * 1000 * count / loop_count,
+                                                            loop_count / loop_time))
+
+
+if __name__ == "__main__":
+    main()
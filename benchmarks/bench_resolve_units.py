@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of resolving a column of free-text unit names
+
+compares looking up every row (Simplify + Synonyms, as convert() does)
+with ConverterClass.ResolveUnits, which looks up each distinct name once.
+
+run with:
+
+python bench_resolve_units.py [number_of_rows]
+"""
+
+import sys, os, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from hazpy import unit_conversion
+
+NAMES = ["Barrels", "bbl", " BBLS ", "gal", "Gallons", "m^3", "cubic meter", "liters", "spam"]
+
+
+def per_row(Converter, units):
+    IDs = np.empty(len(units), dtype=np.intp)
+    for i, unit in enumerate(units):
+        try:
+            IDs[i] = Converter.UnitID(unit)
+        except unit_conversion.InvalidUnitError:
+            IDs[i] = -1
+    return IDs
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    units = np.random.RandomState(0).choice(NAMES, rows)
+    Converter = unit_conversion.Converters["volume"]
+
+    for name, column in (("unicode array", units), ("object array", units.astype(object))):
+        start = time.time()
+        expected = per_row(Converter, column)
+        loop_time = time.time() - start
+
+        start = time.time()
+        codes = Converter.ResolveUnits(column)[0]
+        bulk_time = time.time() - start
+
+        assert np.array_equal(codes, expected)
+        print("%s, %i rows:" % (name, rows))
+        print("  per row lookup: %8.3f s" % loop_time)
+        print("  ResolveUnits:   %8.3f s  (%.0f times faster)" % (bulk_time, loop_time / bulk_time))
+
+
+if __name__ == "__main__":
+    main()
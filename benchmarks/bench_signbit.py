@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""
+Micro-benchmark of signbit, on its own and inside the LatLongConverter methods
+
+compares the math.copysign based signbit with the old struct based one:
+
+  (doubleToRawLongBits(value) >> 63) == 1
+
+run with:
+
+python bench_signbit.py
+"""
+
+import sys, os, timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hazpy.unit_conversion import lat_long
+
+
+def struct_signbit(value):
+    return (lat_long.doubleToRawLongBits(value) >> 63) == 1
+
+fast_signbit = lat_long.signbit
+
+CASES = [("signbit(-0.0)", "lat_long.signbit(-0.0)"),
+         ("ToDecDeg(-0.0, 20, 20)", "LLC.ToDecDeg(-0.0, 20, 20)"),
+         ("ToDegMin(-120.7625)", "LLC.ToDegMin(-120.7625)"),
+         ("ToDegMinSec(-120.7625)", "LLC.ToDegMinSec(-120.7625)"),
+         ]
+
+
+def time_it(code, number):
+    setup = "from hazpy.unit_conversion import lat_long; LLC = lat_long.LatLongConverter"
+    return min(timeit.repeat(code, setup, repeat=5, number=number)) / number
+
+
+def main():
+    number = 100000
+    print("%-26s %12s %12s" % ("", "struct", "copysign"))
+    for name, code in CASES:
+        lat_long.signbit = struct_signbit
+        old = time_it(code, number)
+        lat_long.signbit = fast_signbit
+        new = time_it(code, number)
+        print("%-26s %9.3f us %9.3f us  (%.1fx)" % (name, old * 1e6, new * 1e6, old / new))
+
+
+if __name__ == "__main__":
+    main()
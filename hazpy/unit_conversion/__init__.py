@@ -4,7 +4,8 @@
 unit_conversion package
 
 All it really contains is the one unit_conversion module,
-a data module, plus a module for lat-lon conversion.
+a data module, plus a module for lat-lon conversion, and one for
+distances between lat-lon positions (geodesy), and along tracks (track).
 
 All of unit_conversion is imported here for convenience
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+Command line unit conversion of columns in CSV files:
+
+python -m hazpy.unit_conversion input.csv output.csv -c "Depth:Length:ft:m" -c "Speed:m/s:knots"
+
+or, for columns with the units in the name, like "Depth (ft)":
+
+python -m hazpy.unit_conversion input.csv output.csv --to SI
+
+"-" is stdin / stdout. Run with --help for all the options.
+"""
+
+import sys
+import argparse
+
+from hazpy.unit_conversion import file_conversion
+from hazpy.unit_conversion.unit_conversion import UnitConversionError
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m hazpy.unit_conversion",
+        description="Convert the units of columns in a CSV file. The file is "
+                    "streamed through a chunk of rows at a time, so it can be any size.")
+    parser.add_argument("infile", help='CSV file to convert, with a header row ("-" for stdin)')
+    parser.add_argument("outfile", help='file to write ("-" for stdout)')
+    parser.add_argument("-c", "--convert", action="append", default=[], metavar="SPEC",
+                        help='a column to convert: "column:unit_type:from_unit:to_unit", or '
+                             '"column:from_unit:to_unit" if the unit name is unique. '
+                             'Can be given more than once.')
+    parser.add_argument("--to", dest="unit_system", choices=sorted(file_conversion.UNIT_SYSTEMS),
+                        help='convert all the (other) columns with a unit in the name -- '
+                             '"Depth (ft)", "Temp [deg F]" -- to this unit system')
+    parser.add_argument("--lat", action="append", default=[], metavar="COLUMN",
+                        help="a column of decimal degrees latitude to format")
+    parser.add_argument("--lon", action="append", default=[], metavar="COLUMN",
+                        help="a column of decimal degrees longitude to format")
+    parser.add_argument("--latlon-style", type=int, default=2, choices=[1, 2, 3],
+                        help="1: decimal degrees, 2: degrees, minutes (default), "
+                             "3: degrees, minutes, seconds")
+    parser.add_argument("--chunk-size", type=int, default=file_conversion.DEFAULT_CHUNK_SIZE,
+                        help="number of rows converted at a time (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="don't report the rows converted and the rows/s")
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    try:
+        conversions = [file_conversion.ColumnConversion.from_spec(spec) for spec in args.convert]
+        converter = file_conversion.CSVConverter(conversions,
+                                                 lat_columns=args.lat,
+                                                 lon_columns=args.lon,
+                                                 latlon_style=args.latlon_style,
+                                                 unit_system=args.unit_system,
+                                                 chunk_size=args.chunk_size)
+        stats = converter.convert_file(args.infile, args.outfile)
+    except (ValueError, UnitConversionError, EnvironmentError) as err:
+        parser.exit(2, "%s: error: %s\n" % (parser.prog, err))
+    if not args.quiet:
+        for conversion in stats.conversions:
+            sys.stderr.write("%s: %s -> %s\n" % (conversion.column, conversion.handle.from_unit,
+                                                 conversion.handle.to_unit))
+        sys.stderr.write("%s\n" % stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
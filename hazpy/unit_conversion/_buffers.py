@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Conversion of array.array, memoryview and other buffer objects -- without
+numpy.
+
+The values are pulled out of the buffer into something that can be
+iterated over quickly (the array.array itself, if that's what it is),
+converted in a plain Python loop, and stored in an array.array:
+
+    values, typecode = buffer_values(buf)
+    result = store([v * factor for v in values], typecode, out)
+
+Raw bytes (bytearray, mmap.mmap, buffer...) are taken to be float64.
+"""
+
+import array, mmap
+
+# memoryview and array.array are the typed ones
+BUFFER_TYPES = (array.array, memoryview, bytearray, buffer, mmap.mmap)
+
+
+def is_buffer(value):
+    """
+    True if value should be converted with the buffer code
+    """
+    return isinstance(value, BUFFER_TYPES)
+
+
+def buffer_values(values):
+    """
+    returns (sequence, typecode): the numbers in values, and the
+    array.array typecode for the result -- "f" for float32 values,
+    "d" for anything else.
+    """
+    if isinstance(values, array.array):
+        sequence = values
+    elif isinstance(values, memoryview) and values.format.lstrip("@") != "B":
+        sequence = array.array(values.format.lstrip("@"), values.tobytes())
+    else:
+        if isinstance(values, memoryview):
+            values = values.tobytes()
+        sequence = array.array("d")
+        sequence.fromstring(buffer(values))
+    return sequence, "f" if sequence.typecode == "f" else "d"
+
+
+def store(result, typecode, out=None):
+    """
+    stores the list of converted values in an array.array of typecode --
+    or in out, which must be the same length: an array.array, or a
+    writable buffer of bytes (bytearray, mmap.mmap...) that the values
+    are written to as float64.
+
+    returns the array.array (or out)
+    """
+    if out is None:
+        # str(): the typecode may be unicode, from a unicode_literals module
+        return array.array(str(typecode), result)
+    if isinstance(out, array.array):
+        if len(out) != len(result):
+            raise ValueError("out must be the same length as the values")
+        out[:] = array.array(out.typecode, result)
+        return out
+    if isinstance(out, memoryview) and out.format.lstrip("@") != "B":
+        raise TypeError("out can't be a typed memoryview -- use an array.array")
+    data = array.array("d", result).tostring()
+    if len(data) != len(out):
+        raise ValueError("out must be the same length as the values")
+    out[:] = data
+    return out
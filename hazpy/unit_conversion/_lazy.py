@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+Lazy importing of optional, slow to import, modules (i.e. numpy)
+
+numpy is only needed for the array conversions, and importing it takes
+longer than importing all of the rest of this package, so it is not
+imported until it is used:
+
+    from _lazy import np
+
+    np.multiply(a, b) # numpy is imported here, the first time it's used
+
+"""
+
+import sys
+
+
+class LazyModule(object):
+    """
+    Stand-in for a module that is imported the first time one of its
+    attributes is accessed.
+
+    It has no public attributes of its own, so every attribute is the
+    module's (np.load is numpy.load) -- use load() and available() below
+    to work with the stand-in itself.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        value = getattr(load(self), attr)
+        setattr(self, attr, value) # so the next lookup doesn't come through here
+        return value
+
+
+def load(lazy_module):
+    """
+    imports the module of a LazyModule (if it hasn't been already) and
+    returns it
+
+    raises an ImportError if it is not available
+    """
+    if lazy_module._module is None:
+        __import__(lazy_module._name)
+        lazy_module._module = sys.modules[lazy_module._name]
+    return lazy_module._module
+
+
+def available(lazy_module):
+    """
+    True if the module of a LazyModule can be imported
+    """
+    try:
+        load(lazy_module)
+    except ImportError:
+        return False
+    return True
+
+
+np = LazyModule("numpy")
+
+
+def is_ndarray(value):
+    """
+    True if value is a numpy array
+
+    Does not import numpy -- if it hasn't been imported yet, there can't
+    be any arrays.
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of many files at once, in parallel
+
+    from hazpy.unit_conversion.batch import BatchSpec, run_batch
+
+    spec = BatchSpec(columns=[("Depth", "Length", "ft", "m")], unit_system="SI")
+    summary = run_batch(glob.glob("daily/*.csv"), "converted", spec,
+                        workers=8, progress_file="converted/done.txt")
+    print summary
+
+CSV files are converted with file_conversion.CSVConverter; .npy files
+(one array of values, all in one unit) with spec.array.
+
+The files are farmed out to a concurrent.futures.ProcessPoolExecutor. Only
+the BatchSpec -- a few tuples of unit names -- goes to the workers; each
+worker process loads the unit tables and builds its converters once, and
+re-uses them for all its files.
+
+If there is a progress_file, each file is recorded in it as it is
+finished, and files already recorded are skipped -- so an interrupted
+batch can be re-run to finish it. Files that fail are not recorded, so
+they are tried again.
+
+On Python 2, concurrent.futures is the "futures" package from PyPI --
+without it, only workers=1 (everything in this process) is available.
+
+Requires numpy.
+"""
+
+import os, time
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+except ImportError: # py2 without the "futures" backport
+    ProcessPoolExecutor = None
+
+from _lazy import np
+from unit_conversion import Converters, get_unit_index, get_converter
+import file_conversion
+
+DEFAULT_CHUNK_SIZE = file_conversion.DEFAULT_CHUNK_SIZE
+
+
+class BatchSpec(object):
+    """
+    What to do to every file in a batch -- small, and picklable, so it is
+    cheap to send to the worker processes.
+
+    BatchSpec(columns=(), unit_system=None, lat_columns=(), lon_columns=(),
+              latlon_style=2, array=None, chunk_size=DEFAULT_CHUNK_SIZE)
+
+    :param columns: for CSV files: (column, unit_type, from_unit, to_unit)
+                    tuples -- unit_type can be None (see ColumnConversion)
+    :param unit_system, lat_columns, lon_columns, latlon_style: for CSV
+                    files -- see CSVConverter
+    :param array: for .npy files: (unit_type, from_unit, to_unit)
+    :param chunk_size: rows of CSV, or elements of an array, at a time
+    """
+
+    def __init__(self, columns=(), unit_system=None, lat_columns=(), lon_columns=(),
+                 latlon_style=2, array=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.columns = tuple(tuple(column) for column in columns)
+        self.unit_system = unit_system
+        self.lat_columns = tuple(lat_columns)
+        self.lon_columns = tuple(lon_columns)
+        self.latlon_style = latlon_style
+        self.array = None if array is None else tuple(array)
+        self.chunk_size = chunk_size
+
+    def key(self):
+        unit_system = self.unit_system
+        if isinstance(unit_system, dict):
+            unit_system = tuple(sorted(unit_system.items()))
+        return (self.columns, unit_system, self.lat_columns, self.lon_columns,
+                self.latlon_style, self.array, self.chunk_size)
+
+    def csv_converter(self):
+        conversions = [file_conversion.ColumnConversion(*column) for column in self.columns]
+        return file_conversion.CSVConverter(conversions,
+                                            lat_columns=self.lat_columns,
+                                            lon_columns=self.lon_columns,
+                                            latlon_style=self.latlon_style,
+                                            unit_system=self.unit_system,
+                                            chunk_size=self.chunk_size)
+
+    def array_converter(self):
+        if self.array is None:
+            raise ValueError("no array conversion in the BatchSpec for a .npy file")
+        return get_converter(*self.array)
+
+
+## The worker side -- these run in the worker processes
+
+# the converters built for each spec -- one set per process
+_worker_converters = {}
+_worker_loaded = False
+
+def _worker_setup():
+    # load all the unit tables and the index once, up front
+    global _worker_loaded
+    if not _worker_loaded:
+        Converters.load_all()
+        get_unit_index()
+        _worker_loaded = True
+
+def _converters(spec):
+    _worker_setup()
+    return _worker_converters.setdefault(spec.key(), {})
+
+def convert_npy(handle, infilename, outfilename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    convert_npy(handle, infilename, outfilename, chunk_size=DEFAULT_CHUNK_SIZE)
+
+    converts the array in a .npy file with a UnitConverter, chunk_size
+    elements at a time -- neither array is loaded into memory all at once.
+
+    returns (elements, invalid)
+    """
+    values = np.load(infilename, mmap_mode="r")
+    dtype = values.dtype if values.dtype.kind == "f" else np.float64
+    fortran_order = values.flags.f_contiguous and not values.flags.c_contiguous
+    out = np.lib.format.open_memmap(outfilename, mode="w+", dtype=dtype, shape=values.shape,
+                                    fortran_order=fortran_order)
+    # flat views of both, in memory order
+    flat_in, flat_out = values.reshape(-1, order="A"), out.reshape(-1, order="A")
+    invalid = 0
+    for start in range(0, flat_in.size, chunk_size):
+        block = slice(start, start + chunk_size)
+        result, valid = handle.ConvertWithMask(flat_in[block], out=flat_out[block])
+        invalid += result.size - int(valid.sum())
+    out.flush()
+    del out
+    return values.size, invalid
+
+def _convert_file(spec, infilename, outfilename):
+    """
+    converts one file -- the function run in the workers
+
+    returns (infilename, rows, invalid, seconds, error) -- error is None,
+    or the error message (the worker doesn't stop for one bad file)
+    """
+    start = time.time()
+    try:
+        converters = _converters(spec)
+        if infilename.lower().endswith(".npy"):
+            if "array" not in converters:
+                converters["array"] = spec.array_converter()
+            rows, invalid = convert_npy(converters["array"], infilename, outfilename, spec.chunk_size)
+        else:
+            if "csv" not in converters:
+                converters["csv"] = spec.csv_converter()
+            stats = converters["csv"].convert_file(infilename, outfilename)
+            rows, invalid = stats.rows, stats.invalid
+    except Exception as err:
+        return infilename, 0, 0, time.time() - start, "%s: %s" % (err.__class__.__name__, err)
+    return infilename, rows, invalid, time.time() - start, None
+
+
+## The runner side
+class BatchSummary(object):
+    """
+    What a batch did:
+
+    .converted, .skipped (already in the progress file): lists of file names
+    .failed: a list of (file name, error message)
+    .rows, .invalid: totals for the converted files (for arrays, elements)
+    .seconds: the wall clock time for the whole batch
+    """
+
+    def __init__(self):
+        self.converted = []
+        self.skipped = []
+        self.failed = []
+        self.rows = 0
+        self.invalid = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    @property
+    def files_per_second(self):
+        return len(self.converted) / self.seconds if self.seconds else float("inf")
+
+    def __str__(self):
+        lines = ["%i files converted, %i skipped, %i failed in %.2f s (%.1f files/s)" %
+                 (len(self.converted), len(self.skipped), len(self.failed), self.seconds,
+                  self.files_per_second),
+                 "%i rows (%.0f rows/s), %i cells not converted" %
+                 (self.rows, self.rows_per_second, self.invalid)]
+        lines += ["  %s: %s" % failure for failure in self.failed]
+        return "\n".join(lines)
+
+
+def read_progress(progress_file):
+    """returns the set of files recorded as done in a progress file"""
+    if progress_file is None or not os.path.exists(progress_file):
+        return set()
+    with open(progress_file) as infile:
+        return set(line.rstrip("\n") for line in infile if line.strip())
+
+
+def run_batch(infilenames, output_dir, spec, workers=None, progress_file=None):
+    """
+    run_batch(infilenames, output_dir, spec, workers=None, progress_file=None)
+
+    converts each of the files according to spec, writing a file of the
+    same name in output_dir.
+
+    Raises a ValueError, before anything is converted, if two of the files
+    have the same name (from different directories) -- they would be
+    written to the same output file.
+
+    :param workers: the number of worker processes -- the number of CPUs
+                    if None. 1 runs everything in this process (as does
+                    None, if concurrent.futures is not available).
+    :param progress_file: the file to record finished files in, and skip
+                          the files already there.
+
+    returns a BatchSummary
+    """
+    start = time.time()
+    summary = BatchSummary()
+    done = read_progress(progress_file)
+    jobs = []
+    outputs = {}
+    for infilename in infilenames:
+        infilename = os.path.abspath(infilename)
+        outfilename = os.path.join(output_dir, os.path.basename(infilename))
+        if os.path.abspath(outfilename) == infilename:
+            raise ValueError("output_dir can't be the directory the files are in")
+        if outfilename in outputs:
+            raise ValueError("%s and %s would both be written to %s" %
+                             (outputs[outfilename], infilename, outfilename))
+        outputs[outfilename] = infilename
+        if infilename in done:
+            summary.skipped.append(infilename)
+            continue
+        jobs.append((infilename, outfilename))
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    progress = open(progress_file, "a") if progress_file is not None else None
+    try:
+        for result in _run(spec, jobs, workers):
+            infilename, rows, invalid, seconds, error = result
+            if error is not None:
+                summary.failed.append((infilename, error))
+                continue
+            summary.converted.append(infilename)
+            summary.rows += rows
+            summary.invalid += invalid
+            if progress is not None:
+                progress.write(infilename + "\n")
+                progress.flush()
+    finally:
+        if progress is not None:
+            progress.close()
+    summary.seconds = time.time() - start
+    return summary
+
+def _run(spec, jobs, workers):
+    """yields the results of _convert_file for the jobs, as they finish"""
+    if ProcessPoolExecutor is None and workers not in (None, 1):
+        raise ImportError("concurrent.futures is required for workers > 1 -- "
+                          "on Python 2: pip install futures")
+    if workers == 1 or len(jobs) <= 1 or ProcessPoolExecutor is None:
+        for infilename, outfilename in jobs:
+            yield _convert_file(spec, infilename, outfilename)
+        return
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_convert_file, spec, infilename, outfilename)
+                   for infilename, outfilename in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True)
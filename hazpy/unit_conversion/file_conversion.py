@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of columns in (large) CSV files
+
+The file is streamed through a chunk of rows at a time, so memory use
+doesn't depend on the size of the file. Each column is converted with a
+handle from get_converter, looked up once, on a whole chunk at a time:
+
+    from hazpy.unit_conversion.file_conversion import CSVConverter, ColumnConversion
+
+    converter = CSVConverter([ColumnConversion("Depth", "Length", "ft", "m"),
+                              ColumnConversion("Speed", "Velocity", "m/s", "knots")],
+                             lat_columns=["Lat"], lon_columns=["Lon"])
+    stats = converter.convert_file("model_output.csv", "converted.csv")
+    print stats
+
+Cells that are not numbers (e.g. blank) are passed through unchanged.
+
+Columns with the unit in the name -- "Depth (ft)", "Temp [deg F]" -- can
+be found and converted automatically, to one of the UNIT_SYSTEMS (or your
+own dict of unit type: unit):
+
+    converter = CSVConverter([], unit_system="SI")
+
+"Depth (ft)" becomes "Depth (m)", etc. Units that are not in the unit index
+(see find_unit_type) are left alone.
+
+This is what "python -m hazpy.unit_conversion" runs -- see __main__.py
+
+Requires numpy.
+"""
+
+import sys, re, time, csv
+from itertools import islice
+
+from _lazy import np
+from unit_conversion import get_converter, find_unit_type, InvalidUnitError
+import lat_long
+
+DEFAULT_CHUNK_SIZE = 10000 # rows
+
+# the unit to use for each unit type
+UNIT_SYSTEMS = {"SI": {"Length": "m",
+                       "Area": "m^2",
+                       "Volume": "m^3",
+                       "Mass": "kg",
+                       "Density": "kg/m^3",
+                       "Temperature": "C",
+                       "Time": "s",
+                       "Velocity": "m/s",
+                       "Discharge": "m^3/s",
+                       "Kinematic Viscosity": "m^2/s",
+                       },
+                "metric": {"Length": "m",
+                           "Area": "km^2",
+                           "Volume": "m^3",
+                           "Mass": "tonnes",
+                           "Density": "kg/m^3",
+                           "Temperature": "C",
+                           "Time": "hr",
+                           "Velocity": "m/s",
+                           "Discharge": "m^3/hr",
+                           "Kinematic Viscosity": "cSt",
+                           },
+                "US": {"Length": "ft",
+                       "Area": "acres",
+                       "Volume": "bbl",
+                       "Mass": "lb",
+                       "Density": "lbs/ft^3",
+                       "Temperature": "F",
+                       "Time": "hr",
+                       "Velocity": "knots",
+                       "Discharge": "bbl/day",
+                       "Kinematic Viscosity": "cSt",
+                       },
+                }
+
+# a unit at the end of a column name, in () or []
+HEADER_UNIT_PATTERN = re.compile(r"\(\s*(?P<paren>[^()]+?)\s*\)\s*$|\[\s*(?P<bracket>[^\[\]]+?)\s*\]\s*$")
+
+
+class ColumnConversion(object):
+    """
+    The conversion of one column of a CSV file:
+
+    ColumnConversion(column, unit_type, from_unit, to_unit, output_name=None)
+
+    unit_type can be None, if from_unit is in the unit index (see
+    find_unit_type). output_name is the name for the column in the output
+    file. If None, it is the column name -- with the unit replaced by
+    to_unit if the name has a unit of this type in it: "Depth (ft)" =>
+    "Depth (m)" (see header_unit).
+    """
+
+    def __init__(self, column, unit_type, from_unit, to_unit, output_name=None):
+        if unit_type is None:
+            unit_type = find_unit_type(from_unit)
+        self.column = column
+        self.handle = get_converter(unit_type, from_unit, to_unit)
+        if output_name is None:
+            output_name = column
+            found = header_unit(column)
+            if found is not None and found[0] == self.handle.unit_type:
+                start, end = found[2]
+                output_name = column[:start] + to_unit + column[end:]
+        self.output_name = output_name
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        ColumnConversion.from_spec("column:unit_type:from_unit:to_unit")
+
+        The unit_type can be left out: "column:from_unit:to_unit" -- unless
+        the column name has a colon in it.
+        """
+        parts = spec.rsplit(":", 3)
+        if len(parts) == 4:
+            return cls(*parts)
+        elif len(parts) == 3:
+            return cls(parts[0], None, parts[1], parts[2])
+        raise ValueError("column conversion must be column:unit_type:from_unit:to_unit, "
+                         "or column:from_unit:to_unit -- not %r" % spec)
+
+    def __repr__(self):
+        return "ColumnConversion(%r, %r, %r, %r)" % (self.column, self.handle.unit_type,
+                                                     self.handle.from_unit, self.handle.to_unit)
+
+
+def header_unit(column):
+    """
+    header_unit(column)
+
+    returns (unit_type, unit, span) for a column name with a unit at the
+    end: "Temp [deg F]" => ("Temperature", "deg F", (6, 11)). span is
+    where the unit is in the name.
+
+    returns None if there is no unit, or it is not in the unit index.
+    """
+    match = HEADER_UNIT_PATTERN.search(column)
+    if match is None:
+        return None
+    group = "paren" if match.group("paren") is not None else "bracket"
+    unit = match.group(group)
+    try:
+        unit_type = find_unit_type(unit)
+    except InvalidUnitError:
+        return None
+    return unit_type, unit, match.span(group)
+
+
+def plan_header_conversions(header, unit_system, exclude=()):
+    """
+    plan_header_conversions(header, unit_system, exclude=())
+
+    returns a list of ColumnConversions for the columns in header that
+    have a unit in the name (see header_unit) of one of the types in
+    unit_system -- except those already in the right unit, or in exclude.
+
+    :param unit_system: the name of one of the UNIT_SYSTEMS, or a dict of
+                        unit type: unit.
+
+    The output name is the column name with the new unit.
+    """
+    if not isinstance(unit_system, dict):
+        try:
+            unit_system = UNIT_SYSTEMS[unit_system]
+        except KeyError:
+            raise ValueError("unit system must be one of: %s" % ", ".join(sorted(UNIT_SYSTEMS)))
+    conversions = []
+    for column in header:
+        if column in exclude:
+            continue
+        found = header_unit(column)
+        if found is None:
+            continue
+        unit_type, unit, (start, end) = found
+        to_unit = unit_system.get(unit_type)
+        if to_unit is None:
+            continue
+        conversion = ColumnConversion(column, unit_type, unit, to_unit,
+                                      output_name=column[:start] + to_unit + column[end:])
+        if conversion.handle.from_unit != conversion.handle.to_unit:
+            conversions.append(conversion)
+    return conversions
+
+
+class ConversionStats(object):
+    """
+    What a conversion did: .rows, .seconds, .invalid (the number of cells
+    that could not be converted), and .rows_per_second
+
+    .conversions is the list of ColumnConversions done
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.invalid = 0
+        self.seconds = 0.0
+        self.conversions = []
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def __str__(self):
+        return ("%i rows in %.2f s (%.0f rows/s), %i cells not converted" %
+                (self.rows, self.seconds, self.rows_per_second, self.invalid))
+
+
+def parse_floats(cells):
+    """
+    returns (values, valid) for a list of strings
+
+    values is a float64 array, NaN where the string is not a number.
+    """
+    try:
+        values = np.array(cells, dtype=np.float64)
+    except ValueError:
+        # some are not numbers -- do them one by one
+        values = np.empty(len(cells))
+        for i, cell in enumerate(cells):
+            try:
+                values[i] = float(cell)
+            except ValueError:
+                values[i] = np.nan
+    return values, np.isfinite(values)
+
+
+def _text(value):
+    # the csv module in py2 needs bytes
+    if not isinstance(value, str):
+        return value.encode("utf-8")
+    return value
+
+
+def open_csv(filename, mode="r"):
+    """
+    opens a file the way the csv module wants it -- "-" is stdin/stdout
+    """
+    if filename == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    if sys.version_info[0] < 3:
+        return open(filename, mode + "b")
+    return open(filename, mode, newline="")
+
+
+class CSVConverter(object):
+    """
+    Converts columns of a CSV file, streaming it a chunk at a time
+
+    CSVConverter(conversions, lat_columns=(), lon_columns=(),
+                 latlon_style=2, unit_system=None, chunk_size=DEFAULT_CHUNK_SIZE)
+
+    :param conversions: a sequence of ColumnConversions
+    :param unit_system: if not None, all the other columns with a unit in
+                        the name are converted to this unit system -- see
+                        plan_header_conversions
+    :param lat_columns, lon_columns: names of columns of decimal degrees to
+                                     format with format_lat_array /
+                                     format_lon_array
+    :param latlon_style: 1, 2, or 3 -- see lat_long.TEMPLATES
+    :param chunk_size: the number of rows converted at a time
+    """
+
+    def __init__(self, conversions, lat_columns=(), lon_columns=(),
+                 latlon_style=2, unit_system=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if latlon_style not in lat_long.TEMPLATES:
+            raise ValueError("latlon_style must be 1, 2, or 3")
+        if not (unit_system is None or isinstance(unit_system, dict) or unit_system in UNIT_SYSTEMS):
+            raise ValueError("unit system must be one of: %s" % ", ".join(sorted(UNIT_SYSTEMS)))
+        self.conversions = list(conversions)
+        self.lat_columns = list(lat_columns)
+        self.lon_columns = list(lon_columns)
+        self.latlon_style = latlon_style
+        self.unit_system = unit_system
+        self.chunk_size = chunk_size
+
+    def plan(self, header):
+        """
+        returns the list of ColumnConversions that will be done on a file
+        with this header
+        """
+        conversions = list(self.conversions)
+        if self.unit_system is not None:
+            exclude = set([c.column for c in conversions] + self.lat_columns + self.lon_columns)
+            conversions += plan_header_conversions(header, self.unit_system, exclude)
+        return conversions
+
+    def _plan(self, header):
+        """
+        returns a list of (index, function) for the columns to convert,
+        the output header, and the ColumnConversions
+
+        each function takes a list of cells and returns (cells, invalid)
+        """
+        conversions = self.plan(header)
+        index = dict((name, i) for i, name in enumerate(header))
+        missing = [c.column for c in conversions if c.column not in index]
+        missing += [c for c in self.lat_columns + self.lon_columns if c not in index]
+        if missing:
+            raise ValueError("columns not in the file: %s" % ", ".join(missing))
+
+        plan = []
+        out_header = list(header)
+        for conversion in conversions:
+            plan.append((index[conversion.column], self._converter(conversion.handle)))
+            out_header[index[conversion.column]] = conversion.output_name
+        for column in self.lat_columns:
+            plan.append((index[column], self._formatter(lat_long.format_lat_array)))
+        for column in self.lon_columns:
+            plan.append((index[column], self._formatter(lat_long.format_lon_array)))
+        return plan, out_header, conversions
+
+    @staticmethod
+    def _converter(handle):
+        def convert(cells):
+            values, valid = parse_floats(cells)
+            result = handle(values, out=values).tolist()
+            if valid.all():
+                return [repr(value) for value in result], 0
+            return ([repr(value) if ok else cell
+                     for value, ok, cell in zip(result, valid.tolist(), cells)],
+                    len(cells) - int(valid.sum()))
+        return convert
+
+    def _formatter(self, format_array):
+        style = self.latlon_style
+        def format(cells):
+            values, valid = parse_floats(cells)
+            formatted = format_array(np.where(valid, values, 0.0), style)
+            return ([_text(text) if ok else cell
+                     for text, ok, cell in zip(formatted, valid.tolist(), cells)],
+                    len(cells) - int(valid.sum()))
+        return format
+
+    def convert_stream(self, infile, outfile):
+        """
+        convert_stream(infile, outfile)
+
+        converts CSV from one open file to another -- the first row must
+        be the column names.
+
+        Rows shorter than the header are padded with empty cells, and any
+        cells past the end of the header are written out unchanged.
+
+        returns a ConversionStats
+        """
+        stats = ConversionStats()
+        start = time.time()
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile, lineterminator="\n")
+        try:
+            header = next(reader)
+        except StopIteration:
+            return stats # empty file
+        plan, out_header, stats.conversions = self._plan(header)
+        writer.writerow([_text(name) for name in out_header])
+        while True:
+            rows = list(islice(reader, self.chunk_size))
+            if not rows:
+                break
+            # columns in, columns out -- short rows are padded to the header
+            width = len(header)
+            columns = list(zip(*[row[:width] + [""] * (width - len(row)) for row in rows]))
+            columns = [list(column) for column in columns]
+            for i, function in plan:
+                columns[i], invalid = function(columns[i])
+                stats.invalid += invalid
+            out_rows = zip(*columns)
+            if any(len(row) > width for row in rows):
+                # cells past the end of the header are passed through as they are
+                out_rows = [list(out_row) + row[width:] for out_row, row in zip(out_rows, rows)]
+            writer.writerows(out_rows)
+            stats.rows += len(rows)
+        stats.seconds = time.time() - start
+        return stats
+
+    def convert_file(self, infilename, outfilename):
+        """
+        convert_file(infilename, outfilename)
+
+        converts a CSV file to another -- "-" for stdin/stdout.
+
+        returns a ConversionStats
+        """
+        infile = open_csv(infilename, "r")
+        try:
+            outfile = open_csv(outfilename, "w")
+            try:
+                return self.convert_stream(infile, outfile)
+            finally:
+                if outfile is not sys.stdout:
+                    outfile.close()
+        finally:
+            if infile is not sys.stdin:
+                infile.close()
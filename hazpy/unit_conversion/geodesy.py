@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+"""
+Distances and bearings between positions on the earth.
+
+The positions can be Latitude/Longitude objects, LatitudeArray/LongitudeArray,
+or plain (arrays of) decimal degrees. Everything is vectorized with numpy
+(required), and the distances can be returned in any "Length" unit:
+
+    from hazpy.unit_conversion import geodesy
+
+    geodesy.distance(lat1, lon1, lat2, lon2, unit="nautical mile")
+    geodesy.initial_bearing(lat1, lon1, lat2, lon2)
+    geodesy.distance_matrix(incident_lats, incident_lons, lats, lons, unit="km")
+    geodesy.polygon_area(lats, lons, offsets, unit="sq nm")
+
+Two methods are available:
+
+"haversine" (the default) treats the earth as a sphere, with the radius
+that makes a minute of latitude exactly one nautical mile -- the
+"latitude minute" in the Length table. Good to a few tenths of a percent.
+
+"vincenty" uses the WGS84 ellipsoid -- good to a fraction of a mm, but
+several times slower.
+"""
+
+import math
+
+from _lazy import np
+from lat_long import Latitude, LatitudeArray
+from unit_data import ConvertDataUnits
+from unit_conversion import get_converter
+
+# the radius that makes one minute of latitude one "latitude minute"
+EARTH_RADIUS = ConvertDataUnits["Length"]["latitude minute"][0] * 60 * 180 / math.pi # meters
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0 # meters
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+VINCENTY_TOLERANCE = 1e-12 # radians -- about 0.006 mm
+VINCENTY_MAX_ITERATIONS = 200
+
+
+def as_degrees(values):
+    """
+    returns decimal degrees as a float64 array, from any of:
+
+    Latitude/Longitude objects (or a sequence of them), LatitudeArray or
+    LongitudeArray, or numbers (or arrays of numbers).
+    """
+    if isinstance(values, Latitude):
+        values = values.value
+    elif isinstance(values, LatitudeArray):
+        values = values.values
+    elif isinstance(values, (list, tuple)) and values and isinstance(values[0], Latitude):
+        values = [v.value for v in values]
+    return np.asarray(values, dtype=np.float64)
+
+def _to_unit(meters, unit):
+    """converts the distance in meters to unit -- a float if it is 0-d"""
+    to_unit = get_converter("Length", "meter", unit)
+    if np.ndim(meters) == 0:
+        return float(to_unit(float(meters)))
+    return to_unit(meters, out=meters)
+
+def _haversine(phi1, lam1, cos_phi1, phi2, lam2, cos_phi2):
+    """central angle in radians, all inputs in radians"""
+    a = (np.sin((phi2 - phi1) / 2) ** 2 +
+         cos_phi1 * cos_phi2 * np.sin((lam2 - lam1) / 2) ** 2)
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def _vincenty(phi1, lam1, phi2, lam2):
+    """
+    distance in meters on the WGS84 ellipsoid, all inputs in radians
+
+    The (rare) nearly antipodal points where the iteration doesn't
+    converge get the spherical distance.
+    """
+    f = WGS84_F
+    L = lam2 - lam1
+    U1 = np.arctan((1 - f) * np.tan(phi1))
+    U2 = np.arctan((1 - f) * np.tan(phi2))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L
+    converged = np.zeros(np.broadcast(L, U1, U2).shape, dtype=bool)
+    for i in range(VINCENTY_MAX_ITERATIONS):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.sqrt((cosU2 * sin_lam) ** 2 +
+                            (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2)
+        cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        coincident = sin_sigma == 0.0
+        sin_alpha = np.where(coincident, 0.0,
+                             cosU1 * cosU2 * sin_lam / np.where(coincident, 1.0, sin_sigma))
+        cos2_alpha = 1 - sin_alpha ** 2
+        equatorial = cos2_alpha == 0.0
+        cos_2sigma_m = np.where(equatorial, 0.0,
+                                cos_sigma - 2 * sinU1 * sinU2 / np.where(equatorial, 1.0, cos2_alpha))
+        C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        lam_prev = lam
+        lam = L + (1 - C) * f * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)))
+        converged = np.abs(lam - lam_prev) < VINCENTY_TOLERANCE
+        if converged.all():
+            break
+
+    u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sigma_m ** 2) -
+        B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)))
+    meters = WGS84_B * A * (sigma - delta_sigma)
+    if not converged.all():
+        spherical = EARTH_RADIUS * _haversine(phi1, lam1, np.cos(phi1), phi2, lam2, np.cos(phi2))
+        meters = np.where(converged, meters, spherical)
+    return meters
+
+def _distance_meters(phi1, lam1, phi2, lam2, method):
+    if method == "haversine":
+        return EARTH_RADIUS * _haversine(phi1, lam1, np.cos(phi1), phi2, lam2, np.cos(phi2))
+    elif method == "vincenty":
+        return _vincenty(phi1, lam1, phi2, lam2)
+    else:
+        raise ValueError("method must be 'haversine' or 'vincenty'")
+
+def distance(lat1, lon1, lat2, lon2, unit="meter", method="haversine"):
+    """
+    distance(lat1, lon1, lat2, lon2, unit="meter", method="haversine")
+
+    returns the distance between (lat1, lon1) and (lat2, lon2), in unit --
+    any "Length" unit.
+
+    The inputs are broadcast together, so this can be one position to many,
+    or many pairs of positions. A float is returned if they are all scalars.
+    """
+    phi1, lam1, phi2, lam2 = [np.radians(as_degrees(v)) for v in (lat1, lon1, lat2, lon2)]
+    return _to_unit(_distance_meters(phi1, lam1, phi2, lam2, method), unit)
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """
+    initial_bearing(lat1, lon1, lat2, lon2)
+
+    returns the initial bearing of the great circle from (lat1, lon1) to
+    (lat2, lon2): in degrees clockwise from North, 0 to 360.
+
+    The inputs are broadcast together. A float is returned if they are all
+    scalars. The bearing between coincident points is 0.
+    """
+    phi1, lam1, phi2, lam2 = [np.radians(as_degrees(v)) for v in (lat1, lon1, lat2, lon2)]
+    d_lam = lam2 - lam1
+    theta = np.arctan2(np.sin(d_lam) * np.cos(phi2),
+                       np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(d_lam))
+    bearing = np.degrees(theta) % 360.0
+    if bearing.ndim == 0:
+        return float(bearing)
+    return bearing
+
+def distance_matrix(lat1, lon1, lat2, lon2, unit="meter", method="haversine",
+                    chunk_size=1000000, out=None):
+    """
+    distance_matrix(lat1, lon1, lat2, lon2, unit="meter", method="haversine",
+                    chunk_size=1000000, out=None)
+
+    returns the (N, M) array of distances from each of the N positions
+    (lat1, lon1) to each of the M positions (lat2, lon2), in unit.
+
+    It is computed a block of rows at a time, so that the temporaries are
+    no more than about chunk_size elements -- only the result has to fit
+    in memory. That can be a pre-allocated array (or a numpy.memmap),
+    passed in as out.
+    """
+    phi1, lam1 = [np.radians(as_degrees(v)).reshape(-1) for v in (lat1, lon1)]
+    phi2, lam2 = [np.radians(as_degrees(v)).reshape(-1) for v in (lat2, lon2)]
+    N, M = len(phi1), len(phi2)
+    if out is None:
+        out = np.empty((N, M), dtype=np.float64)
+    elif out.shape != (N, M):
+        raise ValueError("out must have shape %s" % ((N, M),))
+
+    to_unit = get_converter("Length", "meter", unit)
+    cos_phi1, cos_phi2 = np.cos(phi1), np.cos(phi2)
+    rows = max(1, chunk_size // max(M, 1))
+    for start in range(0, N, rows):
+        stop = min(start + rows, N)
+        block = slice(start, stop)
+        if method == "haversine":
+            meters = EARTH_RADIUS * _haversine(phi1[block, None], lam1[block, None], cos_phi1[block, None],
+                                               phi2, lam2, cos_phi2)
+        else:
+            meters = _distance_meters(phi1[block, None], lam1[block, None], phi2, lam2, method)
+        to_unit(meters, out=out[block])
+    return out
+
+def polygon_area(lats, lons, offsets=None, unit="square meter"):
+    """
+    polygon_area(lats, lons, offsets=None, unit="square meter")
+
+    returns the area of a polygon on the (spherical) earth, in unit --
+    any "Area" unit. The edges are great circles.
+
+    :param lats, lons: the vertices, in order (either direction). The
+                       polygon is closed: the last vertex is joined to the
+                       first (repeating the first vertex at the end is OK).
+    :param offsets: for many polygons in one go: lats and lons are all of
+                    their vertices, one after another, and offsets is the
+                    index of the first vertex of each polygon -- starting
+                    with 0. An array of the areas is returned.
+
+    Polygons with fewer than three vertices have zero area. Polygons that
+    contain a pole are not supported.
+    """
+    phi = np.radians(as_degrees(lats)).reshape(-1)
+    lam = np.radians(as_degrees(lons)).reshape(-1)
+    if len(phi) != len(lam):
+        raise ValueError("lats and lons must be the same length")
+    single = offsets is None
+    offsets = np.zeros(1, dtype=np.intp) if single else np.asarray(offsets, dtype=np.intp).reshape(-1)
+    n = len(phi)
+    if len(offsets) and (offsets[0] != 0 or (np.diff(offsets) < 0).any() or offsets[-1] > n):
+        raise ValueError("offsets must start at 0 and be increasing")
+    lengths = np.diff(np.append(offsets, n))
+
+    # the index of the next vertex -- wrapping around to the start of each polygon
+    following = np.arange(1, n + 1)
+    filled = lengths > 0
+    following[(offsets + lengths - 1)[filled]] = offsets[filled]
+
+    # the signed area between each edge and the equator, as a spherical excess
+    t = np.tan(phi / 2)
+    t2 = t[following]
+    d_lam = (lam[following] - lam + np.pi) % (2 * np.pi) - np.pi # across the dateline, too
+    excess = 2 * np.arctan2(np.tan(d_lam / 2) * (t + t2), 1 + t * t2)
+
+    areas = np.zeros(len(offsets))
+    if n:
+        areas[filled] = np.add.reduceat(excess, offsets[filled])
+    areas = np.abs(areas) * EARTH_RADIUS ** 2
+    areas[lengths < 3] = 0.0
+    areas = get_converter("Area", "square meter", unit)(areas, out=areas)
+    if single:
+        return float(areas[0])
+    return areas
+
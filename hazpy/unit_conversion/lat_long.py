@@ -8,7 +8,12 @@ from __future__ import unicode_literals
 
 __version__ = "1.4"
 
-import math, struct
+import itertools, math, re, struct
+
+# numpy is only required for the array versions -- and only imported when used
+from _lazy import np
+# array.array and other buffers are converted without numpy
+from _buffers import is_buffer, buffer_values, store
 
 
 def signbit(value):
@@ -45,8 +50,21 @@ def signbit(value):
     useful if someone wants to convert a latitude or longitude like:
     -0.0degrees, 34minutes to  0d34'00"S
 
+    math.copysign copies the sign bit, so is used here, rather than
+    looking at the bits directly with doubleToRawLongBits -- it is
+    several times faster. For arrays, use signbit_array.
+
+    """
+    return math.copysign(1.0, value) < 0.0
+
+def signbit_array(values):
+    """
+    signbit for arrays: returns a boolean array that is True where the
+    sign bit of the value is set (including -0.0)
+
+    @type  values: array or sequence of floats
     """
-    return (doubleToRawLongBits(value) >> 63) == 1
+    return np.signbit(np.asarray(values, dtype=np.float64))
 
 def doubleToRawLongBits(value):
     """
@@ -60,6 +78,22 @@ def doubleToRawLongBits(value):
     # pack double into 64 bits, then unpack as long int
     return struct.unpack(b'Q', struct.pack(b'd', value))[0]
 
+def _round_array(values, ndigits):
+    """
+    numpy.round(values, ndigits), but giving exactly the same results as
+    the builtin round() does for each value.
+
+    numpy.round multiplies by 10**ndigits and rounds to an integer, which
+    can tip values very close to half way the other way, so those few
+    values are re-done with round().
+    """
+    result = np.round(values, ndigits)
+    scaled = np.abs(values) * 10.0**ndigits
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-3
+    for i in np.flatnonzero(near_half):
+        result.flat[i] = round(values.flat[i], ndigits)
+    return result
+
 class LatLongConverter:
     @classmethod
     def ToDecDeg(self, d=0, m=0, s=0, ustring = False, max=180):
@@ -150,9 +184,157 @@ class LatLongConverter:
         else:
             return (Sign * float(Degrees), Minutes, Seconds)
 
+    ## array versions of the above -- these require numpy, unless they are
+    ## given array.array (or other buffer) values, which are converted one
+    ## at a time, exactly as the scalar versions do, into array.arrays
+    @classmethod
+    def ToDecDegArray(self, d=0, m=0, s=0, max=180, strict=False):
+        """
+        DecDegrees, valid = ToDecDegArray(d=0, m=0, s=0, max=180, strict=False)
+
+        converts arrays of degrees, minutes, seconds to decimal degrees.
+
+        The arrays (or scalars) are broadcast together. The same rules as
+        ToDecDeg are applied to each element -- valid is a boolean array
+        that is False where they are broken, and DecDegrees is NaN there.
+
+        If strict is True, a ValueError is raised instead, as ToDecDeg does.
+
+        If any of d, m, s is an array.array or other buffer, the others
+        must be the same length (or scalars), and DecDegrees is an
+        array.array("d"), valid an array.array("b").
+        """
+        if is_buffer(d) or is_buffer(m) or is_buffer(s):
+            return self._ToDecDegBuffer(d, m, s, max, strict)
+        d = np.asarray(d, dtype=np.float64)
+        m = np.asarray(m, dtype=np.float64)
+        s = np.asarray(s, dtype=np.float64)
+
+        errors = [((m < 0) | (s < 0),
+                   "Minutes and Seconds have to be positive"),
+                  ((m > 60.0) | (s > 60.0),
+                   "Minutes and Seconds have to be between -180 and 180"),
+                  (np.abs(d) > max,
+                   "Degrees have to be between -180 and 180"),
+                  ((np.modf(d)[0] != 0.0) & ((m != 0.0) | (s != 0.0)),
+                   "degrees cannot have fraction unless both minutes"
+                   "and seconds are zero"),
+                  ((np.modf(m)[0] != 0.0) & (s != 0.0),
+                   "minutes cannot have fraction unless seconds are zero"),
+                  ]
+        invalid = np.zeros(np.broadcast(d, m, s).shape, dtype=bool)
+        for mask, message in errors:
+            if strict and mask.any():
+                raise ValueError(message)
+            invalid |= mask
+
+        Sign = np.where(signbit_array(d), -1.0, 1.0)
+        DecDegrees = Sign * (np.abs(d) + m/60.0 + s/3600.0)
+        return np.where(invalid, np.nan, DecDegrees), ~invalid
+
+    @classmethod
+    def ToDegMinArray(self, DecDegrees):
+        """
+        Degrees, Minutes = ToDegMinArray(DecDegrees)
+
+        converts an array of decimal degrees to arrays of:
+          Degrees, Minutes
+
+        as ToDegMin does for a single value: the Degrees are floats, to
+        preserve -0.0.
+
+        An array.array (or other buffer) is converted to array.arrays.
+        """
+        if is_buffer(DecDegrees):
+            return self._ToDegMinBuffer(DecDegrees)
+        DecDegrees = np.asarray(DecDegrees, dtype=np.float64)
+        Sign = np.where(signbit_array(DecDegrees), -1.0, 1.0)
+        DecDegrees = np.abs(DecDegrees)
+        Degrees = np.trunc(DecDegrees)
+        DecMinutes = _round_array((DecDegrees - Degrees + 1e-14) * 60, 10)# add a tiny bit then round to avoid binary rounding issues
+        return Sign * Degrees, DecMinutes
+
+    @classmethod
+    def ToDegMinSecArray(self, DecDegrees):
+        """
+        Degrees, Minutes, Seconds = ToDegMinSecArray(DecDegrees)
+
+        converts an array of decimal degrees to arrays of:
+          Degrees, Minutes, Seconds
+
+        as ToDegMinSec does for a single value: the Degrees are floats, to
+        preserve -0.0, the Minutes are integers.
+
+        An array.array (or other buffer) is converted to array.arrays --
+        array.array("l") for the Minutes.
+        """
+        if is_buffer(DecDegrees):
+            return self._ToDegMinSecBuffer(DecDegrees)
+        DecDegrees = np.asarray(DecDegrees, dtype=np.float64)
+        Sign = np.where(signbit_array(DecDegrees), -1.0, 1.0)
+        DecDegrees = np.abs(DecDegrees)
+        Degrees = np.trunc(DecDegrees)
+        DecMinutes = (DecDegrees - Degrees + 1e-14) * 60 # add a tiny bit to avoid rounding issues
+
+        Minutes = np.trunc(DecMinutes)
+        Seconds = _round_array((DecMinutes - Minutes) * 60, 10)
+        return Sign * Degrees, Minutes.astype(np.int64), Seconds
+
+    @classmethod
+    def _ToDecDegBuffer(self, d, m, s, max, strict):
+        columns = [buffer_values(x)[0] if is_buffer(x) else None for x in (d, m, s)]
+        sizes = set(len(column) for column in columns if column is not None)
+        if len(sizes) > 1:
+            raise ValueError("d, m and s must be the same length")
+        size = sizes.pop()
+        columns = [itertools.repeat(x, size) if column is None else column
+                   for x, column in zip((d, m, s), columns)]
+
+        ToDecDeg = self.ToDecDeg
+        DecDegrees, valid = [], []
+        for d, m, s in itertools.izip(*columns):
+            try:
+                DecDegrees.append(ToDecDeg(d, m, s, max=max))
+                valid.append(True)
+            except ValueError:
+                if strict:
+                    raise
+                DecDegrees.append(float("nan"))
+                valid.append(False)
+        return store(DecDegrees, "d"), store(valid, "b")
+
+    @classmethod
+    def _ToDegMinBuffer(self, DecDegrees):
+        # ToDegMin, inlined
+        copysign = math.copysign
+        Degrees, Minutes = [], []
+        for value in buffer_values(DecDegrees)[0]:
+            sign = copysign(1.0, value)
+            value = abs(value)
+            degrees = int(value)
+            Degrees.append(sign * degrees)
+            Minutes.append(round((value - degrees + 1e-14) * 60, 10))
+        return store(Degrees, "d"), store(Minutes, "d")
+
+    @classmethod
+    def _ToDegMinSecBuffer(self, DecDegrees):
+        # ToDegMinSec, inlined
+        copysign = math.copysign
+        Degrees, Minutes, Seconds = [], [], []
+        for value in buffer_values(DecDegrees)[0]:
+            sign = copysign(1.0, value)
+            value = abs(value)
+            degrees = int(value)
+            minutes = (value - degrees + 1e-14) * 60
+            whole_minutes = int(minutes)
+            Degrees.append(sign * degrees)
+            Minutes.append(whole_minutes)
+            Seconds.append(round((minutes - whole_minutes) * 60, 10))
+        return store(Degrees, "d"), store(Minutes, "l"), store(Seconds, "d")
+
 ## These are classes used in our web apps: ResponseLink, etc.
 ## They provide a different interface to lat-long format conversion
-class Latitude:
+class Latitude(object):
     """An object that can interpret a latitude in various formats.
 
        Constructor:
@@ -165,6 +347,9 @@ class Latitude:
              insensitive), or None.
            - if 'direction' is not None, 'deg' cannot be negative.
 
+       Latitude.from_decimal(value), Latitude.from_array(values)
+           - for values already in decimal degrees: only the range is checked.
+
        Attributes:
        .value : a float in decimal degrees.  Positive is North; negative is
            South.  (These apply to zero too; positive zero is North.)
@@ -196,6 +381,7 @@ class Latitude:
        >>> print str(lat1)
        Latitude(-120.762500)
     """
+    __slots__ = ("value",) # we keep a lot of these around -- see also LatitudeArray
     negative_direction = "South"
     positive_direction = "North"
     min = -90.0
@@ -218,6 +404,42 @@ class Latitude:
                 raise ValueError(msg)
         
         self.value = LatLongConverter.ToDecDeg(deg, min, sec, max=self.max)
+
+    @classmethod
+    def _from_value(cls, value):
+        # no checks at all
+        obj = object.__new__(cls)
+        obj.value = value
+        return obj
+
+    @classmethod
+    def from_decimal(cls, value):
+        """
+        Latitude.from_decimal(value)
+
+        Constructor for a value that is already in decimal degrees
+        (e.g. from our database): only checks that it is between min and
+        max, not all the degrees/minutes/seconds rules.
+        """
+        value = float(value)
+        if not cls.min <= value <= cls.max: # NaN fails too
+            raise ValueError("Degrees have to be between %s and %s" % (cls.min, cls.max))
+        return cls._from_value(value)
+
+    @classmethod
+    def from_array(cls, values):
+        """
+        Latitude.from_array(values)
+
+        returns a list of Latitudes from a sequence of decimal degrees.
+
+        The bounds are checked once, for the whole batch -- a ValueError is
+        raised if any of the values is out of range. (requires numpy)
+
+        If you don't need the objects, LatitudeArray(values) is much smaller.
+        """
+        values = _check_bounds(values, cls)
+        return [cls._from_value(value) for value in values.tolist()]
         
     def direction(self):
         if self.value < 0.0:
@@ -272,12 +494,20 @@ class Latitude:
         """
         return self.format(style).replace(u"\xb0", u"&deg;").encode("ascii")
 
+    # needed to pickle with __slots__ (the tuple, so that 0.0 is kept)
+    def __getstate__(self):
+        return (self.value,)
+
+    def __setstate__(self, state):
+        self.value, = state
+
 class Longitude(Latitude):
     """See Latitude docstring.
     
        Positive is East; negative is West.  Degrees must be between -180.0 and
        180.0
     """
+    __slots__ = ()
     negative_direction = "West"
     positive_direction = "East"
     min = -180.0
@@ -301,6 +531,174 @@ class DummyLongitude(DummyLatitude):
     """
     pass
 
+## Columns of Latitudes/Longitudes -- these require numpy
+def _check_bounds(values, cls):
+    """
+    returns values as a 1-d float64 array
+
+    raises a ValueError if any of them are outside cls.min to cls.max, or NaN
+    """
+    values = np.array(values, dtype=np.float64).reshape(-1)
+    out_of_range = (values < cls.min) | (values > cls.max) | np.isnan(values)
+    if out_of_range.any():
+        raise ValueError("Degrees have to be between %s and %s" % (cls.min, cls.max))
+    return values
+
+class LatitudeArray(object):
+    """A column of latitudes, stored as a single float64 array.
+
+       This is the same interface as Latitude, but every method returns
+       arrays (or, for format(), a list), and it takes 8 bytes per value
+       rather than a whole Python object.
+
+       Constructor:
+       LatitudeArray(values)
+           - 'values' is a sequence of decimal degrees, all between
+             Latitude.min and Latitude.max -- a ValueError is raised if not.
+
+       Attributes:
+       .values : the float64 array of decimal degrees.
+
+       Indexing with an integer gives a Latitude, with a slice or an
+       index array gives another LatitudeArray.
+    """
+    __slots__ = ("values",)
+    element_class = Latitude
+
+    def __init__(self, values):
+        self.values = _check_bounds(values, self.element_class)
+
+    def _new(self, values):
+        # no checks -- values come from one of us
+        new = object.__new__(self.__class__)
+        new.values = values
+        return new
+
+    def _element(self, value):
+        return self.element_class._from_value(float(value))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        value = self.values[index]
+        if isinstance(value, np.ndarray):
+            return self._new(value)
+        return self._element(value)
+
+    def __iter__(self):
+        for value in self.values.tolist():
+            yield self._element(value)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.values.tolist())
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def direction(self):
+        return np.where(self.values < 0.0,
+                        self.element_class.negative_direction,
+                        self.element_class.positive_direction)
+
+    def degrees(self):
+        return np.abs(self.values), self.direction()
+
+    def degrees_minutes(self):
+        deg, min = LatLongConverter.ToDegMinArray(np.abs(self.values))
+        return deg, min, self.direction()
+
+    def degrees_minutes_seconds(self):
+        deg, min, sec = LatLongConverter.ToDegMinSecArray(np.abs(self.values))
+        return deg, min, sec, self.direction()
+
+    def format(self, style):
+        """
+        format(style)
+
+        returns a list of formatted values, exactly as Latitude.format(style)
+        would for each one.
+        """
+        if style == 1:
+            template = u'''%0.2f\xb0 %s'''
+            columns = self.degrees()
+        elif style == 2:
+            template = u'''%d\xb0 %0.2f' %s'''
+            columns = self.degrees_minutes()
+        elif style == 3:
+            template = u'''%d\xb0 %d' %0.2f" %s'''
+            columns = self.degrees_minutes_seconds()
+        else:
+            raise ValueError("style must be 1, 2, or 3")
+        columns = [column.tolist() for column in columns]
+        return [template % row for row in zip(*columns)]
+
+class LongitudeArray(LatitudeArray):
+    """See LatitudeArray docstring."""
+    __slots__ = ()
+    element_class = Longitude
+
+class LatLonArray(object):
+    """A column of positions: a LatitudeArray and a LongitudeArray of the
+       same length -- two float64 arrays, 16 bytes per position.
+
+       Constructor:
+       LatLonArray(lats, lons)
+
+       Attributes:
+       .lat : LatitudeArray
+       .lon : LongitudeArray
+
+       The methods return a pair of whatever the LatitudeArray and
+       LongitudeArray methods return, except format(), which returns
+       a list of "lat, lon" strings.
+    """
+    __slots__ = ("lat", "lon")
+
+    def __init__(self, lats, lons):
+        lat = lats if isinstance(lats, LatitudeArray) else LatitudeArray(lats)
+        lon = lons if isinstance(lons, LongitudeArray) else LongitudeArray(lons)
+        if len(lat) != len(lon):
+            raise ValueError("lats and lons must be the same length")
+        self.lat = lat
+        self.lon = lon
+
+    def __len__(self):
+        return len(self.lat)
+
+    def __getitem__(self, index):
+        lat, lon = self.lat[index], self.lon[index]
+        if isinstance(lat, LatitudeArray):
+            return LatLonArray(lat, lon)
+        return lat, lon
+
+    def __iter__(self):
+        return iter(zip(self.lat, self.lon))
+
+    def __repr__(self):
+        return "LatLonArray(%r, %r)" % (self.lat.values.tolist(), self.lon.values.tolist())
+
+    @property
+    def nbytes(self):
+        return self.lat.nbytes + self.lon.nbytes
+
+    def direction(self):
+        return self.lat.direction(), self.lon.direction()
+
+    def degrees(self):
+        return self.lat.degrees(), self.lon.degrees()
+
+    def degrees_minutes(self):
+        return self.lat.degrees_minutes(), self.lon.degrees_minutes()
+
+    def degrees_minutes_seconds(self):
+        return self.lat.degrees_minutes_seconds(), self.lon.degrees_minutes_seconds()
+
+    def format(self, style, separator=", "):
+        return [lat + separator + lon
+                for lat, lon in zip(self.lat.format(style), self.lon.format(style))]
+
 
 ## The new simple API -- just methods that do what we need for ResponseLink, etc.
 DEGREES = "\xb0"     # "DEGREE SIGN"
@@ -355,5 +753,232 @@ def format_lon_dms(f):
     return format_latlon3(f, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION)
 
 
+## Bulk versions of the above -- these require numpy
+# printf-style equivalents of FORMAT1, FORMAT2, FORMAT3, with the direction filled in
+TEMPLATES = {1: "%.2f\N{DEGREE SIGN} {}",
+             2: "%.0f\N{DEGREE SIGN} %.2f\N{PRIME} {}",
+             3: "%.0f\N{DEGREE SIGN} %.0f\N{PRIME} %.2f\N{DOUBLE PRIME} {}",
+             }
+
+def reduce_base_60_array(f):
+    """
+    reduce_base_60 for an array: returns (whole, fract) arrays
+    """
+    fract, whole = np.modf(f)
+    # Add a tiny bit before rounding to avoid binary rounding errors.
+    fract = np.abs(fract)
+    fract = (fract + 1e-14) * 60
+    fract = _round_array(fract, 10)
+    return whole, fract
+
+def format_latlon_array(values, positive_direction, negative_direction, style=2):
+    """
+    formats a whole array of latitudes or longitudes
+
+    returns a list of strings, the same as format_latlon2 (style=2) or
+    format_latlon3 (style=3) would for each value. style=1 is decimal
+    degrees (FORMAT1).
+
+    The base-60 arithmetic is done on the whole array at once.
+    """
+    try:
+        template = TEMPLATES[style]
+    except KeyError:
+        raise ValueError("style must be 1, 2, or 3")
+    values = np.asarray(values, dtype=np.float64).ravel()
+    positive = (values >= 0.0).tolist()
+    if style == 1:
+        fields = [np.abs(values)]
+    else:
+        degrees, minutes = reduce_base_60_array(values)
+        if style == 2:
+            fields = [np.abs(degrees), minutes]
+        else:
+            minutes, seconds = reduce_base_60_array(minutes)
+            fields = [np.abs(degrees), minutes, seconds]
+    positive_template = template.format(positive_direction)
+    negative_template = template.format(negative_direction)
+    return [(positive_template if pos else negative_template) % field
+            for pos, field in zip(positive, zip(*[a.tolist() for a in fields]))]
+
+def format_lat_array(values, style=2):
+    """
+    format_lat (style=2) or format_lat_dms (style=3) for a whole array
+    """
+    return format_latlon_array(values, LAT_POSITIVE_DIRECTION, LAT_NEGATIVE_DIRECTION, style)
+
+def format_lon_array(values, style=2):
+    """
+    format_lon (style=2) or format_lon_dms (style=3) for a whole array
+    """
+    return format_latlon_array(values, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION, style)
+
+def write_positions(stream, lats, lons, style=2, separator=", ", chunk_size=65536):
+    """
+    writes formatted positions to a text stream, one per line:
+
+    28\xb0 13.12\u2032 North, 92\xb0 37.47\u2032 West
 
+    The positions are formatted and written in chunks, so memory use
+    doesn't grow with the number of positions.
 
+    :param stream: a text (unicode) stream: an open file, io.StringIO, etc.
+    :param lats: array of latitudes in decimal degrees
+    :param lons: array of longitudes in decimal degrees
+    :param style: 1, 2 or 3 -- see format_latlon_array
+    """
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    lons = np.asarray(lons, dtype=np.float64).ravel()
+    if lats.shape != lons.shape:
+        raise ValueError("lats and lons must be the same length")
+    for start in range(0, len(lats), chunk_size):
+        lat_strings = format_lat_array(lats[start:start + chunk_size], style)
+        lon_strings = format_lon_array(lons[start:start + chunk_size], style)
+        stream.write("".join([lat + separator + lon + "\n"
+                              for lat, lon in zip(lat_strings, lon_strings)]))
+
+
+## Parsing -- the inverse of the formatting above
+_NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)"
+_DIRECTION = r"north|south|east|west|[nsew]"
+
+# accepts everything format_lat, format_lat_dms and Latitude.format emit,
+# and the common ASCII variants: 28 13 7.2 S, 28.2186N, 28d 13m 7.2s N, 28:13:07.2N, -28.5 ...
+# A bare "s" is only taken as a seconds marker here if something follows
+# it -- a trailing one is sorted out in split_latlon.
+_LATLON_PATTERN = r"""
+    ^\s*
+    (?P<dir1>%(direction)s)?\s*
+    (?P<sign>[-+])?\s*
+    (?P<deg>%(number)s)\s*
+    (?P<degmark>\u00b0|\u00ba|degrees|degree|deg|d|:)?\s*
+    (?:
+        (?P<min>%(number)s)\s*
+        (?P<minmark>\u2032|'|\u2019|minutes|minute|min|m|:)?\s*
+        (?:
+            (?P<sec>%(number)s)\s*
+            (?P<secmark>\u2033|"|''|\u201d|seconds|second|sec|s(?=\s*\S))?\s*
+        )?
+    )?
+    (?P<dir2>%(direction)s)?
+    \s*$
+    """ % {"number": _NUMBER, "direction": _DIRECTION}
+_latlon_regex = None
+
+def _get_latlon_regex():
+    # compiled the first time it's needed -- compiling it takes longer than
+    # importing the rest of this module
+    global _latlon_regex
+    if _latlon_regex is None:
+        _latlon_regex = re.compile(_LATLON_PATTERN, re.VERBOSE | re.IGNORECASE | re.UNICODE)
+    return _latlon_regex
+
+def _is_seconds_marker(match, negative_direction):
+    """
+    True if the direction matched at the end is really a seconds marker:
+    an "s" after the seconds, as in 28d 13m 7.2s
+
+    It is if the negative direction isn't S (longitude), or if it is right
+    after the seconds and the degrees or minutes have a marker other than
+    ":". If the other markers are there, but the "s" is apart from the
+    seconds (28d 13m 7.2 s) it could be either, so that's an error. With
+    no markers (28 13 7.2 S, 28:13:07.2S) it's South.
+    """
+    if (match.group("dir2").lower() != "s" or match.group("sec") is None
+        or match.group("secmark")):
+        return False
+    if negative_direction[0].upper() != "S":
+        return True
+    marks = [mark for mark in (match.group("degmark"), match.group("minmark"))
+             if mark and mark != ":"]
+    if not marks:
+        return False
+    if match.end("sec") == match.start("dir2"):
+        return True
+    raise ValueError("%r is ambiguous: is the s seconds or South?" % (match.string,))
+
+def split_latlon(text, positive_direction, negative_direction):
+    """
+    splits a text position into degrees, minutes, seconds
+
+    The direction, if there is one, is applied to the sign of the
+    degrees, as Latitude() does. The numbers are not checked, that's
+    left to LatLongConverter.ToDecDeg
+
+    returns (degrees, minutes, seconds) -- all floats
+
+    raises a ValueError if the text can't be interpreted
+    """
+    match = _get_latlon_regex().match(text)
+    if match is None:
+        raise ValueError("%r is not a valid position" % (text,))
+    direction = match.group("dir1")
+    if match.group("dir2"):
+        if _is_seconds_marker(match, negative_direction):
+            pass
+        elif direction:
+            raise ValueError("%r has two directions" % (text,))
+        else:
+            direction = match.group("dir2")
+
+    degrees = float(match.group("deg"))
+    negative = match.group("sign") == "-"
+    if direction:
+        if negative:
+            raise ValueError("degrees cannot be negative if direction is specified")
+        if direction[0].upper() == negative_direction[0].upper():
+            negative = True
+        elif direction[0].upper() != positive_direction[0].upper():
+            raise ValueError("direction must start with %s or %s" %
+                             (positive_direction[0], negative_direction[0]))
+    if negative:
+        degrees = -degrees
+    return (degrees,
+            float(match.group("min") or 0.0),
+            float(match.group("sec") or 0.0))
+
+def parse_latlon(text, positive_direction, negative_direction, max=180):
+    """
+    parses a text position (e.g. "28\xb0 13.12\u2032 North") into decimal degrees
+
+    The same rules are applied as LatLongConverter.ToDecDeg
+
+    raises a ValueError if the text is not a valid position
+    """
+    d, m, s = split_latlon(text, positive_direction, negative_direction)
+    return LatLongConverter.ToDecDeg(d, m, s, max=max)
+
+def parse_lat(text):
+    return parse_latlon(text, LAT_POSITIVE_DIRECTION, LAT_NEGATIVE_DIRECTION, Latitude.max)
+
+def parse_lon(text):
+    return parse_latlon(text, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION, Longitude.max)
+
+def parse_latlon_array(texts, positive_direction, negative_direction, max=180):
+    """
+    parses a whole column of text positions into decimal degrees
+
+    returns (values, valid): valid is a boolean array that is False where
+    the text is not a valid position -- values is NaN there.
+    (requires numpy)
+    """
+    texts = list(texts)
+    d = np.zeros(len(texts))
+    m = np.zeros(len(texts))
+    s = np.zeros(len(texts))
+    parsed = np.ones(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        try:
+            d[i], m[i], s[i] = split_latlon(text, positive_direction, negative_direction)
+        except (ValueError, TypeError):
+            parsed[i] = False
+    values, valid = LatLongConverter.ToDecDegArray(d, m, s, max=max)
+    valid &= parsed
+    values[~valid] = np.nan
+    return values, valid
+
+def parse_lat_array(texts):
+    return parse_latlon_array(texts, LAT_POSITIVE_DIRECTION, LAT_NEGATIVE_DIRECTION, Latitude.max)
+
+def parse_lon_array(texts):
+    return parse_latlon_array(texts, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION, Longitude.max)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+Distance, heading and speed along a track of (time, lat, lon) points,
+e.g. a drifter track.
+
+    from hazpy.unit_conversion import track
+
+    distance, heading, speed = track.track_segments(times, lats, lons,
+                                                    distance_unit="nm",
+                                                    speed_unit="knots")
+
+There is one value per segment -- one less than the number of points. The
+headings are in degrees clockwise from North.
+
+The times can be numpy datetime64 or timedelta64 arrays, or numbers in any
+"Time" unit (time_unit="hours", etc.). Speeds can be in any "Velocity" unit.
+
+For tracks too big to load at once, a TrackAnalyzer takes the points a
+chunk at a time, and keeps the last point of each chunk to join it to the
+next.
+
+Requires numpy.
+"""
+
+from _lazy import np
+from unit_conversion import get_converter
+import geodesy
+
+
+def _as_times(times, time_unit):
+    """
+    returns (times, factor): times as a float64 array, and the factor that
+    converts them to seconds.
+    """
+    times = np.asarray(times)
+    if times.dtype.kind in "Mm": # datetime64, timedelta64
+        microseconds = times.astype(times.dtype.str[:3] + "[us]").astype(np.int64)
+        return microseconds.astype(np.float64), 1e-6
+    return times.astype(np.float64), get_converter("Time", time_unit, "second").factor
+
+def _segments(times, lats, lons, seconds_factor, to_length, speed_factor, method):
+    """
+    the computation for track_segments -- all inputs are float64 arrays of
+    the same length, in the units noted below
+
+    :param times: in any unit -- seconds_factor converts them to seconds
+    :param lats, lons: decimal degrees
+    :param to_length: a Length converter from meters
+    :param speed_factor: converts meters per second to the speed unit
+    """
+    phi, lam = np.radians(lats), np.radians(lons)
+    meters = geodesy._distance_meters(phi[:-1], lam[:-1], phi[1:], lam[1:], method)
+    heading = geodesy.initial_bearing(lats[:-1], lons[:-1], lats[1:], lons[1:])
+    dt = np.diff(times)
+    # the factors folded into one: (meters / (dt * seconds_factor)) * speed_factor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed = meters / dt * (speed_factor / seconds_factor)
+    speed[~(dt > 0.0)] = np.nan # time going backwards (or not at all)
+    return to_length(meters, out=meters), heading, speed
+
+def track_segments(times, lats, lons, distance_unit="meter", speed_unit="meter per second",
+                   time_unit="second", method="haversine"):
+    """
+    track_segments(times, lats, lons, distance_unit="meter",
+                   speed_unit="meter per second", time_unit="second",
+                   method="haversine")
+
+    returns (distance, heading, speed) arrays for each segment of the track
+
+    :param times: datetime64/timedelta64 array, or numbers in time_unit
+    :param lats, lons: anything geodesy.as_degrees takes
+    :param distance_unit: any "Length" unit
+    :param speed_unit: any "Velocity" unit
+    :param method: "haversine" or "vincenty" -- see geodesy
+
+    The speed is NaN where the time doesn't increase.
+    """
+    times, seconds_factor = _as_times(times, time_unit)
+    lats = geodesy.as_degrees(lats).reshape(-1)
+    lons = geodesy.as_degrees(lons).reshape(-1)
+    if not len(times) == len(lats) == len(lons):
+        raise ValueError("times, lats and lons must be the same length")
+    return _segments(times, lats, lons, seconds_factor,
+                     get_converter("Length", "meter", distance_unit),
+                     get_converter("Velocity", "meter per second", speed_unit).factor,
+                     method)
+
+
+class TrackAnalyzer(object):
+    """
+    Computes track segments a chunk of points at a time:
+
+        analyzer = TrackAnalyzer(distance_unit="nm", speed_unit="knots")
+        for times, lats, lons in chunks:
+            distance, heading, speed = analyzer.process(times, lats, lons)
+
+    Each call returns the segments ending in that chunk -- including the
+    one from the last point of the previous chunk -- so the results of all
+    the calls, concatenated, are the same as track_segments on the whole
+    track. The units and method are as for track_segments.
+
+    .total_distance is the length of the track so far, in distance_unit.
+    """
+
+    def __init__(self, distance_unit="meter", speed_unit="meter per second",
+                 time_unit="second", method="haversine"):
+        self.time_unit = time_unit
+        self.method = method
+        self._to_length = get_converter("Length", "meter", distance_unit)
+        self._speed_factor = get_converter("Velocity", "meter per second", speed_unit).factor
+        self.reset()
+
+    def reset(self):
+        """start a new track"""
+        self._last = None # (time, lat, lon) of the last point seen
+        self.total_distance = 0.0
+
+    def process(self, times, lats, lons):
+        """
+        process(times, lats, lons)
+
+        returns (distance, heading, speed) for the segments ending in this chunk
+        """
+        times, seconds_factor = _as_times(times, self.time_unit)
+        lats = geodesy.as_degrees(lats).reshape(-1)
+        lons = geodesy.as_degrees(lons).reshape(-1)
+        if not len(times) == len(lats) == len(lons):
+            raise ValueError("times, lats and lons must be the same length")
+        if len(times) == 0:
+            empty = np.empty(0)
+            return empty, empty.copy(), empty.copy()
+        last = (times[-1], lats[-1], lons[-1])
+        if self._last is not None:
+            times = np.concatenate(([self._last[0]], times))
+            lats = np.concatenate(([self._last[1]], lats))
+            lons = np.concatenate(([self._last[2]], lons))
+        self._last = last
+        distance, heading, speed = _segments(times, lats, lons, seconds_factor,
+                                             self._to_length, self._speed_factor,
+                                             self.method)
+        self.total_distance += distance.sum()
+        return distance, heading, speed
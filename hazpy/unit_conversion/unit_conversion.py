@@ -24,12 +24,18 @@ CHANGELOG:
 
 __version__ = "1.2.2"
 
-import unit_data
-reload(unit_data)
+import abc, os
+
 from unit_data import ConvertDataUnits
 
 from lat_long import LatLongConverter, Latitude, Longitude, DummyLatitude, DummyLongitude # for backward compatibility
 
+# numpy is only required for the array conversions -- and only imported when used
+import _lazy
+from _lazy import np, is_ndarray
+# array.array and other buffers are converted without numpy
+from _buffers import is_buffer, buffer_values, store
+
 ## A few utilities
 def Simplify(String):
     """
@@ -57,6 +63,129 @@ def GetUnitNames(UnitType):
     """
     return ConvertDataUnits[UnitType].keys()
 
+class UnitIndex(object):
+    """
+    Index of all the unit names (primary names and synonyms) in the unit
+    database, mapping each to its unit type and primary name.
+
+    Built once, by get_unit_index() -- it should not be changed after that.
+
+    Names are looked up as given first, then with whitespace and
+    capitalization removed (see Simplify). Simplified names that are
+    ambiguous (e.g. "S" and "s") are only found as given.
+
+    "Oil Concentration" and "Concentration In Water" are not indexed: they
+    duplicate lots of the Length and Density units.
+    """
+    # the unit types with names that duplicate other types
+    excluded_types = ("Oil Concentration", "Concentration In Water")
+
+    def __init__(self, UnitData):
+        """
+        Create the index
+
+        raises a ValueError if a name is duplicated in the units table
+
+        :param UnitData: a dict with the unit data. See unit_data.py for format
+        """
+        self._names = {}
+        for unit_type in UnitData.keys():
+            if unit_type in self.excluded_types:
+                continue # skipping Oil Concentration, 'cause this is really length -- lots of duplicate units!
+                         # skipping Concentration in water, cause this has lots of duplicate units
+            for PrimaryName, data in UnitData[unit_type].items():
+                # add the primary name:
+                self._names[PrimaryName] = (unit_type, PrimaryName)
+                # now the synonyms:
+                for n in data[1]:
+                    if unit_type == "Volume" and n == 'oz':
+                        continue # skip, "oz" is only mass
+                    if n in self._names:
+                        raise ValueError("Duplicate name in units table: %s"%n)
+                    self._names[n] = (unit_type, PrimaryName)
+
+        self._simple_names = {}
+        ambiguous = set()
+        for name, unit in self._names.items():
+            name = Simplify(name)
+            if self._simple_names.setdefault(name, unit) != unit:
+                ambiguous.add(name)
+        for name in ambiguous:
+            del self._simple_names[name]
+
+    def _lookup(self, name):
+        try:
+            return self._names[name]
+        except KeyError:
+            pass
+        try:
+            return self._simple_names[Simplify(name)]
+        except (KeyError, AttributeError):
+            raise InvalidUnitError( (name, None) )
+
+    def find_unit_type(self, name):
+        """
+        returns the unit type of the given unit name
+
+        raises an InvalidUnitError if it is not in the index
+        """
+        return self._lookup(name)[0]
+
+    def canonical_name(self, name):
+        """
+        returns the primary name of the given unit name: "ft" => "foot"
+
+        raises an InvalidUnitError if it is not in the index
+        """
+        return self._lookup(name)[1]
+
+    def is_same_unit(self, name1, name2):
+        """
+        True if the two names are for the same unit (same type and primary name)
+        """
+        try:
+            return self._names[name1] == self._names[name2]
+        except KeyError:
+            return False
+
+    def unit_types(self):
+        """
+        returns a new dict of all the unit names (as given in the
+        units table) to their unit types
+        """
+        return dict([(name, unit[0]) for name, unit in self._names.items()])
+
+    def __contains__(self, name):
+        try:
+            self._lookup(name)
+        except InvalidUnitError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self._names)
+
+_unit_index = None
+def get_unit_index():
+    """
+    returns the UnitIndex for the unit database
+
+    the index is built the first time this is called
+    """
+    global _unit_index
+    if _unit_index is None:
+        _unit_index = UnitIndex(ConvertDataUnits)
+    return _unit_index
+
+def validate_unit_names():
+    """
+    Checks the unit database for duplicated names -- the check is done
+    when the index is built, so only the first call does any work.
+
+    raises a ValueError if there are duplicates
+    """
+    get_unit_index()
+
 def FindUnitTypes():
     """
     returns a mapping of all the unit names to the unit types
@@ -66,25 +195,26 @@ def FindUnitTypes():
 
     Usually not called from user code.
     """
-    unit_types = {}
-    for unit_type in ConvertDataUnits.keys():
-        if unit_type == "Oil Concentration" or unit_type == "Concentration In Water":
-            continue # skipping Oil Concentration, 'cause this is really length -- lots of duplicate units!
-                     # skipping Concentration in water, cause this has lots of duplicate units 
-        for PrimaryName, data in ConvertDataUnits[unit_type].items():
-            # strip out whitespace and capitalization
-            #Pname = Simplify(PrimaryName)
-            Pname = PrimaryName
-            # add the primary name:
-            unit_types[Pname] = unit_type
-            # now the synonyms:
-            for n in data[1]:
-                if unit_type == "Volume" and n == 'oz':
-                    continue # skip, "oz" is only mass
-                if unit_types.has_key(n):
-                    raise ValueError("Duplicate name in units table: %s"%n)
-                unit_types[n] = unit_type
-    return unit_types
+    return get_unit_index().unit_types()
+
+def find_unit_type(unit_name):
+    """
+    returns the unit type for a given unit name: "ft" => "Length"
+
+    raises an InvalidUnitError if the unit is not in the database
+
+    NOTE: "Oil Concentration" and "Concentration In Water" units are not
+          found -- they are all duplicates of other units
+    """
+    return get_unit_index().find_unit_type(unit_name)
+
+def canonical_unit_name(unit_name):
+    """
+    returns the primary name for a given unit name: "ft" => "foot"
+
+    raises an InvalidUnitError if the unit is not in the database
+    """
+    return get_unit_index().canonical_name(unit_name)
 
 def GetUnitAbbreviation(unit_type, unit):
     """
@@ -110,17 +240,78 @@ def is_same_unit(unit1, unit2):
               False if one of them is not in the database.
 
     """
-    all_types = FindUnitTypes()
-    try:
-        type1 = all_types[unit1]
-        type2 = all_types[unit2]
-    except KeyError:
-        return False
-    if type1 != type2:
-        return False
+    return get_unit_index().is_same_unit(unit1, unit2)
+
+def _require_numpy():
+    if not _lazy.available(np):
+        raise ImportError("numpy is required for array conversion")
+
+def _is_array(Value):
+    """
+    True if Value should be converted with the array code, rather than as a scalar
+    """
+    return isinstance(Value, (list, tuple)) or is_ndarray(Value)
+
+# elements converted at a time in place -- 8MB of float64
+IN_PLACE_CHUNK_SIZE = 1 << 20
+
+def _writable_float_view(Values, dtype=None):
+    """
+    returns a writable numpy array that shares memory with Values: a numpy
+    array, or any writable buffer (bytearray, mmap.mmap, array.array,
+    memoryview...) of floats.
+
+    dtype is the type of the values in a raw buffer: float64 if None. An
+    array.array or a typed memoryview has its own type, which must be
+    float32 or float64.
+    """
+    _require_numpy()
+    if is_ndarray(Values):
+        View = Values
     else:
-        Synonyms = Converters[Simplify(type1)].Synonyms
-        return Synonyms[Simplify(unit1)] == Synonyms[Simplify(unit2)]
+        typecode = getattr(Values, "typecode", None) # array.array
+        if typecode is None and isinstance(Values, memoryview):
+            typecode = Values.format.lstrip("@")
+            if typecode == "B": # just bytes
+                typecode = None
+        if typecode is not None:
+            try:
+                dtype = {"d": np.float64, "f": np.float32}[typecode]
+            except KeyError:
+                raise TypeError("only floating point values can be converted in place")
+        elif dtype is None:
+            dtype = np.float64
+        try:
+            View = np.frombuffer(Values, dtype=dtype)
+        except (AttributeError, TypeError): # a py2 memoryview
+            View = np.asarray(Values).reshape(-1).view(dtype)
+    if View.dtype.kind != 'f':
+        raise TypeError("only floating point values can be converted in place")
+    if not View.flags.writeable:
+        raise ValueError("values are read-only")
+    return View
+
+def _simplify_or_none(Unit):
+    """
+    Simplify(), but None for anything that isn't a string (missing values, etc.)
+    """
+    try:
+        return Simplify(Unit)
+    except AttributeError:
+        return None
+
+def _as_float_array(Values):
+    """
+    returns Values as a numpy array of floats
+
+    floating point arrays are passed through as is (no copy), anything
+    else is converted to float64.
+    """
+    _require_numpy()
+    Values = np.asarray(Values)
+    if Values.dtype.kind != 'f':
+        Values = Values.astype(np.float64)
+    return Values
 
 class ConverterClass:
     """
@@ -148,6 +339,53 @@ class ConverterClass:
             for synonym in data[1]:
                 self.Synonyms[Simplify(synonym)] = Pname
 
+        # stable integer IDs for the units: the index into the sorted names
+        self.UnitNames = sorted(self.Convertdata.keys())
+        self.UnitIDs = dict([(name, i) for i, name in enumerate(self.UnitNames)])
+        self._matrices = None
+        self.BuildTables()
+
+    def BuildTables(self):
+        """
+        BuildTables()
+
+        computes the conversion factor for every pair of units:
+
+        self.Factors[FromID][ToID] * Value converts from FromID to ToID
+        """
+        data = [self.Convertdata[name] for name in self.UnitNames]
+        self.Factors = [[From / To for To in data] for From in data]
+
+    def UnitID(self, Unit):
+        """
+        UnitID(Unit)
+
+        returns the integer ID of the given unit: its index in self.UnitNames
+        and the conversion tables.
+
+        raises an InvalidUnitError if it is not a unit of this type
+        """
+        return self.UnitIDs[self.Resolve(Unit)]
+
+    def FactorMatrix(self):
+        """
+        FactorMatrix()
+
+        returns the conversion factors as an NxN numpy array, indexed by
+        unit ID: Value * FactorMatrix()[FromID, ToID]
+
+        so a whole column of factors can be gathered at once:
+
+        FactorMatrix()[FromIDs, ToID]
+        """
+        if self._matrices is None:
+            self._matrices = self._BuildMatrices()
+        return self._matrices[0]
+
+    def _BuildMatrices(self):
+        _require_numpy()
+        return (np.array(self.Factors, dtype=np.float64),)
+
     def Convert(self, FromUnit, ToUnit, Value):
 
         """
@@ -159,19 +397,139 @@ class ConverterClass:
         :param ToUnit: the unit you want the value converted to
         :param Value: the original value
         """
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
+        FromID = self.UnitID(FromUnit)
+        ToID = self.UnitID(ToUnit)
 
+        return Value * self.Factors[FromID][ToID]
+
+    def Resolve(self, Unit):
+        """
+        Resolve(Unit)
+
+        returns the primary (simplified) name of the given unit
+
+        raises an InvalidUnitError if it is not a unit of this type
+        """
+        Unit = Simplify(Unit)
         try:
-            FromUnit = self.Synonyms[FromUnit]
-        except KeyError:
-            raise InvalidUnitError( (FromUnit, self.Name) )
-        try:
-            ToUnit = self.Synonyms[ToUnit]
+            return self.Synonyms[Unit]
         except KeyError:
-            raise InvalidUnitError( (ToUnit, self.Name) )
+            raise InvalidUnitError( (Unit, self.Name) )
+
+    def ConvertArray(self, FromUnit, ToUnit, Values, out=None, dtype=None):
+        """
+        ConvertArray(FromUnit, ToUnit, Values, out=None, dtype=None)
+
+        returns a numpy array of the Values, in the units of ToUnit.
 
-        return Value * self.Convertdata[FromUnit] / self.Convertdata[ToUnit]
+        The units are resolved once for the whole array. Floating point
+        input keeps its dtype, anything else is converted to float64. The
+        shape is preserved.
+
+        :param FromUnit: the unit the original values are in
+        :param ToUnit: the unit you want the values converted to
+        :param Values: the original values: an array or sequence
+        :param out: optional array to put the result in -- can be Values itself
+        :param dtype: optional dtype of the result (e.g. numpy.float32)
+        """
+        return self.GetConverter(FromUnit, ToUnit).ConvertArray(Values, out, dtype)
+
+    def GetConverter(self, FromUnit, ToUnit):
+        """
+        GetConverter(FromUnit, ToUnit)
+
+        returns a UnitConverter for converting from FromUnit to ToUnit,
+        with the units resolved and the conversion factor computed.
+
+        Usually called via get_converter(), which caches the result.
+        """
+        FromUnit = self.Resolve(FromUnit)
+        ToUnit = self.Resolve(ToUnit)
+        factor = self.Factors[self.UnitIDs[FromUnit]][self.UnitIDs[ToUnit]]
+        return LinearConverter(self.Name, FromUnit, ToUnit, factor)
+
+    def ConvertColumn(self, Values, UnitCodes, ToUnit, Categories=None, out=None):
+        """
+        ConvertColumn(Values, UnitCodes, ToUnit, Categories=None, out=None)
+
+        converts an array of values, each in its own unit, to ToUnit.
+
+        The conversion factors for all the values are gathered from the
+        conversion tables at once (see FactorMatrix), rather than
+        converting one value at a time.
+
+        :param Values: the original values
+        :param UnitCodes: array (same shape as Values) of the unit of each
+                          value: either the unit IDs (see UnitID), or, if
+                          Categories is given, indexes into Categories.
+                          A pandas Categorical, or an array of unit
+                          names (see ResolveUnits) can also be passed in.
+        :param ToUnit: the unit you want all the values converted to
+        :param Categories: optional sequence of unit names
+        :param out: optional array to put the result in
+
+        returns (result, valid): valid is a boolean array that is False
+        where the unit code is not a valid unit (or the value is not valid
+        for the unit, e.g. API gravity <= -131.5) -- the result is NaN there.
+        """
+        ToID = self.UnitID(ToUnit)
+        Values = _as_float_array(Values)
+        if Categories is None and hasattr(UnitCodes, "categories"):
+            Categories = UnitCodes.categories
+            UnitCodes = UnitCodes.codes
+        IDs = np.asarray(UnitCodes)
+        if IDs.dtype.kind in 'USO':
+            IDs = self.ResolveUnits(IDs)[0]
+        elif IDs.dtype.kind not in 'iu':
+            raise TypeError("UnitCodes must be an integer array, or unit names")
+
+        if Categories is not None:
+            lookup = np.array([self.UnitIDs.get(self.Synonyms.get(_simplify_or_none(unit)), -1)
+                               for unit in Categories], dtype=np.intp)
+        else:
+            lookup = np.arange(len(self.UnitNames), dtype=np.intp)
+        valid = (IDs >= 0) & (IDs < len(lookup))
+        IDs = np.take(lookup, IDs, mode='clip')
+        valid &= (IDs >= 0)
+        IDs[~valid] = 0
+
+        result = self._ConvertColumn(Values, IDs, ToID, out, valid)
+        result[~valid] = np.nan
+        return result, valid
+
+    def ResolveUnits(self, Units):
+        """
+        ResolveUnits(Units)
+
+        finds the unit IDs for a whole array of unit names.
+
+        Each distinct name is only looked up once, so this is fast for
+        long columns with only a few different names in them
+        ("bbl", " BBLS ", "barrels", ...)
+
+        :param Units: array or sequence of unit names
+
+        returns (codes, valid, unresolved):
+          codes: integer array of the unit IDs (see UnitID), -1 where the
+                 unit is not valid. Same shape as Units.
+          valid: boolean array, False where the unit is not valid
+          unresolved: list of the distinct names that are not valid units
+        """
+        _require_numpy()
+        Units = np.asarray(Units)
+        names = Units.ravel().tolist()
+
+        # could be anything in there (None, nan, ...) -- so use a dict, rather than sorting
+        lookup = dict([(unit, self.UnitIDs.get(self.Synonyms.get(_simplify_or_none(unit)), -1))
+                       for unit in set(names)])
+        codes = np.fromiter(map(lookup.__getitem__, names), dtype=np.intp, count=len(names))
+        codes = codes.reshape(Units.shape)
+        unresolved = [unit for unit, ID in lookup.items() if ID < 0]
+        return codes, codes >= 0, unresolved
+
+    def _ConvertColumn(self, Values, IDs, ToID, out, valid):
+        factors = self.FactorMatrix()[:, ToID].astype(Values.dtype)
+        return np.multiply(Values, factors.take(IDs), out=out)
 
 # the special case classes:
 class TempConverterClass(ConverterClass):
@@ -180,6 +538,53 @@ class TempConverterClass(ConverterClass):
 
     handles the zero-offset shift for K, C, F...
     """
+    def BuildTables(self):
+        """
+        BuildTables()
+
+        computes the conversion coefficients for every pair of units:
+
+        Value * self.Scales[FromID][ToID] + self.Offsets[FromID][ToID]
+        converts from FromID to ToID
+
+        The offset is computed from the value (in the From units) of zero
+        in the To units, so that zero comes out exactly: 32F => 0C
+        """
+        data = [self.Convertdata[name] for name in self.UnitNames]
+        self.Scales = [[A1 / A2 for (A2, B2) in data] for (A1, B1) in data]
+        self.Offsets = [[-((B2 / (A1 / A2) - B1) * (A1 / A2)) for (A2, B2) in data]
+                        for (A1, B1) in data]
+
+    def FactorMatrix(self):
+        """
+        FactorMatrix()
+
+        returns the scales of the conversions as an NxN numpy array.
+
+        The offsets are needed as well -- see AffineMatrices()
+        """
+        return self.AffineMatrices()[0]
+
+    def AffineMatrices(self):
+        """
+        AffineMatrices()
+
+        returns the (scale, offset) NxN numpy arrays, indexed by unit ID:
+
+        Value * scale[FromID, ToID] + offset[FromID, ToID]
+        """
+        if self._matrices is None:
+            self._matrices = self._BuildMatrices()
+        return self._matrices[:2]
+
+    def _BuildMatrices(self):
+        _require_numpy()
+        # and each unit's own (A, B) -- for the same steps as Convert
+        data = np.array([self.Convertdata[name] for name in self.UnitNames], dtype=np.float64)
+        return (np.array(self.Scales, dtype=np.float64),
+                np.array(self.Offsets, dtype=np.float64),
+                data[:, 0], data[:, 1])
+
     def Convert(self, FromUnit, ToUnit, Value):
 
         """
@@ -192,17 +597,8 @@ class TempConverterClass(ConverterClass):
         :param Value: the original value
         """
 
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
-
-        try:
-            FromUnit = self.Synonyms[FromUnit]
-        except KeyError:
-            raise InvalidUnitError( (FromUnit, self.Name) )
-        try:
-            ToUnit = self.Synonyms[ToUnit]
-        except KeyError:
-            raise InvalidUnitError( (ToUnit, self.Name) )
+        FromUnit = self.Resolve(FromUnit)
+        ToUnit = self.Resolve(ToUnit)
 
         A1 = self.Convertdata[FromUnit][0]
         B1 = self.Convertdata[FromUnit][1]
@@ -213,12 +609,53 @@ class TempConverterClass(ConverterClass):
 
         return to_val
 
+    def GetConverter(self, FromUnit, ToUnit):
+        """
+        GetConverter(FromUnit, ToUnit)
+
+        returns an AffineConverter, with the scales and offsets of the two
+        units, that does the same steps as Convert
+        """
+        FromUnit = self.Resolve(FromUnit)
+        ToUnit = self.Resolve(ToUnit)
+        A1, B1 = self.Convertdata[FromUnit]
+        A2, B2 = self.Convertdata[ToUnit]
+
+        return AffineConverter(self.Name, FromUnit, ToUnit, A1, B1, A2, B2)
+
+    def _ConvertColumn(self, Values, IDs, ToID, out, valid):
+        # the same steps as Convert: ((Value + B1) * A1 / A2) - B2
+        self.AffineMatrices() # builds the tables
+        scales, offsets = self._matrices[2:]
+        result = np.add(Values, offsets.astype(Values.dtype).take(IDs), out=out)
+        np.multiply(result, scales.astype(Values.dtype).take(IDs), out=result)
+        np.divide(result, scales[ToID], out=result)
+        return np.subtract(result, offsets[ToID], out=result)
+
 class DensityConverterClass(ConverterClass):
     """
     Special case class for Density conversion.
 
     handles the special case of API gravity, etc.
     """
+    # API gravity is converted via specific gravity: SG = 141.5 / (API + 131.5)
+    APIUnit = "apidegree"
+    SGUnit = Simplify(u"specific gravity (15\xb0C)")
+
+    def BuildTables(self):
+        """
+        BuildTables()
+
+        computes the conversion factor for every pair of units -- as
+        ConverterClass.BuildTables, except that API gravity is treated
+        as specific gravity: the factors are for the linear part of the
+        conversion. See self.APIID
+        """
+        ConvertData = dict(self.Convertdata)
+        ConvertData[self.APIUnit] = ConvertData[self.SGUnit]
+        data = [ConvertData[name] for name in self.UnitNames]
+        self.Factors = [[From / To for To in data] for From in data]
+        self.APIID = self.UnitIDs[self.APIUnit]
 
     def Convert(self, FromUnit, ToUnit, Value):
 
@@ -231,33 +668,372 @@ class DensityConverterClass(ConverterClass):
         :param ToUnit: the unit you want the value converted to
         :param Value: the original value
         """
+        FromID = self.UnitID(FromUnit)
+        ToID = self.UnitID(ToUnit)
+        factor = self.Factors[FromID][ToID]
+
+        # API gravity is another Special case (could I do this the same as temp?)
+        # the arithmetic is the same as APIGravityConverter, so arrays and scalars match exactly
+        if FromID == self.APIID and ToID == self.APIID:
+            return (Value + 131.5) / factor - 131.5
+        elif FromID == self.APIID:
+            return 141.5 * factor / (Value + 131.5)
+        elif ToID == self.APIID:
+            return 141.5 / factor / Value - 131.5
+        return Value * factor
+
+    def GetConverter(self, FromUnit, ToUnit):
+        """
+        GetConverter(FromUnit, ToUnit)
 
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
-         
-        try:
-            FromUnit = self.Synonyms[FromUnit]
-        except KeyError:
-            raise InvalidUnitError( (FromUnit, self.Name) )
-        try:
-            ToUnit = self.Synonyms[ToUnit]
-        except KeyError:
-            raise InvalidUnitError( (ToUnit, self.Name) )
-        if FromUnit == "apidegree": # another Special case (could I do this the same as temp?)
-            Value = 141.5/(Value + 131.5)
-            FromUnit = u"specificgravity(15\xb0c)"
-        if ToUnit == "apidegree":
-            ToVal = 141.5/(Value * self.Convertdata[FromUnit] / self.Convertdata[u"specificgravity(15\xb0c)"] ) - 131.5
+        returns a LinearConverter, or an APIGravityConverter if either
+        unit is API gravity.
+        """
+        FromUnit = self.Resolve(FromUnit)
+        ToUnit = self.Resolve(ToUnit)
+        factor = self.Factors[self.UnitIDs[FromUnit]][self.UnitIDs[ToUnit]]
+
+        if FromUnit != self.APIUnit and ToUnit != self.APIUnit:
+            return LinearConverter(self.Name, FromUnit, ToUnit, factor)
+        return APIGravityConverter(self.Name, FromUnit, ToUnit, factor,
+                                   FromUnit == self.APIUnit, ToUnit == self.APIUnit)
+
+    def _ConvertColumn(self, Values, IDs, ToID, out, valid):
+        # the same arithmetic as APIGravityConverter
+        is_api = (IDs == self.APIID)
+        api_values = Values[is_api] # a copy -- out may be Values
+        factors = self.FactorMatrix()[:, ToID]
+
+        valid[is_api] &= (api_values > -131.5)
+        if ToID == self.APIID:
+            valid &= (Values > 0.0) | is_api
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if ToID == self.APIID:
+                numerators = (141.5 / factors).astype(Values.dtype)
+                result = np.divide(numerators.take(IDs), Values, out=out)
+                np.subtract(result, 131.5, out=result)
+                result[is_api] = (api_values + 131.5) / factors[self.APIID] - 131.5
+            else:
+                result = np.multiply(Values, factors.astype(Values.dtype).take(IDs), out=out)
+                result[is_api] = 141.5 * factors[self.APIID] / (api_values + 131.5)
+        return result
+
+
+## The conversion handles
+class UnitConverter(object):
+    """
+    Base class for a conversion between two units of one unit type, with
+    everything resolved ahead of time.
+
+    Calling it converts a value:
+
+        handle = get_converter("Length", "feet", "meters")
+        meters = handle(feet)
+
+    The value can be a scalar or an array (see ConverterClass.ConvertArray),
+    or an array.array or other buffer (see ConvertBuffer).
+
+    Handles compare equal (and hash the same) if they convert between the
+    same units. The coefficients are available as .coefficients
+
+    This is an abstract class: the subclasses provide the coefficients and
+    the scalar, array and sequence arithmetic.
+    """
+    __metaclass__ = abc.ABCMeta
+    __slots__ = ("unit_type", "from_unit", "to_unit")
+
+    def __init__(self, unit_type, from_unit, to_unit):
+        self.unit_type = unit_type
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+
+    def __call__(self, value, out=None, dtype=None):
+        if is_buffer(value) or is_buffer(out):
+            return self.ConvertBuffer(value, out)
+        if out is not None or dtype is not None or _is_array(value):
+            return self.ConvertArray(value, out, dtype)
+        return self.Convert(value)
+
+    def ConvertArray(self, values, out=None, dtype=None):
+        """
+        ConvertArray(values, out=None, dtype=None)
+
+        converts a whole array -- see ConverterClass.ConvertArray
+        """
+        values = _as_float_array(values)
+        if out is None and dtype is not None:
+            out = np.empty(values.shape, dtype=dtype)
+        return self._convert_array(values, out)
+
+    def ConvertWithMask(self, values, out=None, dtype=None):
+        """
+        ConvertWithMask(values, out=None, dtype=None)
+
+        converts a whole array, flagging the values that can't be converted.
+
+        returns (result, valid): valid is a boolean array that is False
+        where the value is not finite, or not physically valid (see
+        APIGravityConverter) -- the result is NaN there.
+        """
+        values = _as_float_array(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valid = self._valid(values) # before out (which may be values) is written
+            result = self.ConvertArray(values, out, dtype)
+        result[~valid] = np.nan
+        return result, valid
+
+    def ConvertInPlace(self, values, dtype=None, chunk_size=IN_PLACE_CHUNK_SIZE):
+        """
+        ConvertInPlace(values, dtype=None, chunk_size=IN_PLACE_CHUNK_SIZE)
+
+        converts values in place, chunk_size elements at a time, with no
+        temporary copies (other than for APIGravityConverter).
+
+        values can be a floating point numpy array -- including a
+        numpy.memmap -- or any writable buffer: bytearray, mmap.mmap,
+        array.array... dtype is the type of the values in a buffer (see
+        _writable_float_view).
+
+        If values has a flush() method (numpy.memmap, mmap.mmap), it is
+        called after each chunk, so the changes are written out as it goes.
+
+        returns values
+        """
+        view = _writable_float_view(values, dtype)
+        flush = getattr(values, "flush", None)
+        if view.flags.c_contiguous or view.flags.f_contiguous:
+            flat = view.reshape(-1, order="A")
+            for start in range(0, flat.size, chunk_size):
+                block = flat[start:start + chunk_size]
+                self._convert_array(block, block)
+                if flush is not None:
+                    flush()
         else:
-            ToVal = Value * self.Convertdata[FromUnit] / self.Convertdata[ToUnit]
-        return ToVal
+            # can't be flattened without a copy -- do it all at once
+            self._convert_array(view, view)
+            if flush is not None:
+                flush()
+        return values
+
+    def ConvertBuffer(self, values, out=None):
+        """
+        ConvertBuffer(values, out=None)
+
+        converts an array.array, memoryview or other buffer (bytearray,
+        mmap.mmap... taken to be float64) -- without numpy.
+
+        returns an array.array: float32 ("f") for float32 values, float64
+        ("d") for anything else -- or out, if given (an array.array, or a
+        writable buffer to fill with float64, the same length as values)
+
+        The results are exactly the same as converting the values one at
+        a time.
+        """
+        values, typecode = buffer_values(values)
+        return store(self._convert_sequence(values), typecode, out)
+
+    def _valid(self, values):
+        return np.isfinite(values)
+
+    @abc.abstractproperty
+    def coefficients(self):
+        """the coefficients of the conversion, as a tuple"""
+
+    @abc.abstractmethod
+    def Convert(self, value):
+        """converts a single value"""
+
+    @abc.abstractmethod
+    def _convert_array(self, values, out):
+        """converts a numpy array of floats, into out (which may be None)"""
+
+    @abc.abstractmethod
+    def _convert_sequence(self, values):
+        """converts a sequence of numbers to a list, without numpy"""
+
+    def _key(self):
+        return (self.__class__, self.unit_type, self.from_unit, self.to_unit)
+
+    def __eq__(self, other):
+        return isinstance(other, UnitConverter) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return "%s(%r, %r, %r, %s)" % (self.__class__.__name__, self.unit_type,
+                                       self.from_unit, self.to_unit,
+                                       ", ".join([repr(c) for c in self.coefficients]))
+
+
+class LinearConverter(UnitConverter):
+    """
+    Conversion by a single factor: factor * value
+    """
+    __slots__ = ("factor",)
+
+    def __init__(self, unit_type, from_unit, to_unit, factor):
+        UnitConverter.__init__(self, unit_type, from_unit, to_unit)
+        self.factor = factor
+
+    @property
+    def coefficients(self):
+        return (self.factor,)
+
+    def Convert(self, value):
+        return value * self.factor
+
+    def _convert_array(self, values, out):
+        return np.multiply(values, self.factor, out=out)
+
+    def _convert_sequence(self, values):
+        factor = self.factor
+        return [value * factor for value in values]
+
+
+class AffineConverter(UnitConverter):
+    """
+    Conversion with an offset: ((value + from_offset) * from_scale / to_scale) - to_offset
+
+    Used for temperature. The steps are the ones TempConverterClass.Convert
+    does, in the same order, so arrays and scalars give exactly the same
+    results -- arrays take an add, a multiply, a divide and a subtract, all
+    done in place in the output array.
+    """
+    __slots__ = ("from_scale", "from_offset", "to_scale", "to_offset")
+
+    def __init__(self, unit_type, from_unit, to_unit, from_scale, from_offset, to_scale, to_offset):
+        UnitConverter.__init__(self, unit_type, from_unit, to_unit)
+        self.from_scale = from_scale
+        self.from_offset = from_offset
+        self.to_scale = to_scale
+        self.to_offset = to_offset
+
+    @property
+    def coefficients(self):
+        return (self.from_scale, self.from_offset, self.to_scale, self.to_offset)
+
+    def Convert(self, value):
+        return ((value + self.from_offset) * self.from_scale / self.to_scale) - self.to_offset
+
+    def _convert_array(self, values, out):
+        result = np.add(values, self.from_offset, out=out)
+        np.multiply(result, self.from_scale, out=result)
+        np.divide(result, self.to_scale, out=result)
+        return np.subtract(result, self.to_offset, out=result)
+
+    def _convert_sequence(self, values):
+        A1, B1, A2, B2 = self.coefficients
+        return [((value + B1) * A1 / A2) - B2 for value in values]
+
+
+class APIGravityConverter(UnitConverter):
+    """
+    Conversion to and/or from API gravity
+
+    API gravity is converted to specific gravity with: 141.5 / (API + 131.5)
+    and then to the other unit by factor -- and the reverse if converting to
+    API gravity. The linear parts are folded together:
+
+      from API:    numerator / (value + 131.5)   (numerator = 141.5 * factor)
+      to API:      numerator / value - 131.5     (numerator = 141.5 / factor)
+      API to API:  (value + 131.5) / factor - 131.5
+
+    API gravity <= -131.5, or a density <= 0 converted to API gravity, are
+    not physically valid -- use ConvertWithMask to flag them.
+    """
+    __slots__ = ("factor", "from_api", "to_api", "numerator")
+
+    def __init__(self, unit_type, from_unit, to_unit, factor, from_api, to_api):
+        UnitConverter.__init__(self, unit_type, from_unit, to_unit)
+        self.factor = factor
+        self.from_api = from_api
+        self.to_api = to_api
+        self.numerator = 141.5 * factor if from_api else 141.5 / factor
+
+    @property
+    def coefficients(self):
+        return (self.factor, self.from_api, self.to_api)
+
+    def Convert(self, value):
+        if self.from_api and self.to_api:
+            return (value + 131.5) / self.factor - 131.5
+        elif self.from_api:
+            return self.numerator / (value + 131.5)
+        return self.numerator / value - 131.5
+
+    def _convert_array(self, values, out):
+        if self.from_api:
+            result = np.add(values, 131.5, out=out)
+            if self.to_api:
+                np.divide(result, self.factor, out=result)
+                return np.subtract(result, 131.5, out=result)
+            return np.divide(self.numerator, result, out=result)
+        result = np.divide(self.numerator, values, out=out)
+        return np.subtract(result, 131.5, out=result)
+
+    def _convert_sequence(self, values):
+        # the same arithmetic as Convert, with the branch taken once
+        factor, numerator = self.factor, self.numerator
+        if self.from_api and self.to_api:
+            return [(value + 131.5) / factor - 131.5 for value in values]
+        elif self.from_api:
+            return [numerator / (value + 131.5) for value in values]
+        return [numerator / value - 131.5 for value in values]
+
+    def _valid(self, values):
+        if self.from_api:
+            return np.isfinite(values) & (values > -131.5)
+        return np.isfinite(values) & (values > 0.0)
 
 class OilQuantityConverter:
     """
     class for Oil Quantity conversion -- mass to/from Volume
 
     requires density info as well
+
+    The mass (or volume) and density can be scalars, or numpy arrays (or
+    sequences) that broadcast together -- e.g. an array of releases with
+    an array of densities.
     """
+    _factors = {}
+
+    @classmethod
+    def _Factors(self, MassUnits, DensityUnits, VolumeUnits):
+        """
+        returns (factor, inverse, api) for the given units, such that:
+
+        Volume = factor * Mass / Density
+        Mass = inverse * Volume * Density
+
+        or, if the density is API gravity (api is True):
+
+        Volume = factor * Mass * (Density + 131.5)
+        Mass = inverse * Volume / (Density + 131.5)
+
+        The factors are cached for each set of units.
+        """
+        key = (MassUnits, DensityUnits, VolumeUnits)
+        try:
+            return self._factors[key]
+        except KeyError:
+            pass
+        to_kg = get_converter("Mass", MassUnits, "kg").factor
+        to_volume = get_converter("Volume", "m^3", VolumeUnits).factor
+        density = get_converter("Density", DensityUnits, "kg/m^3")
+        api = isinstance(density, APIGravityConverter)
+        if api:
+            # density in kg/m^3 is: numerator / (API + 131.5)
+            factor = to_kg * to_volume / density.numerator
+        else:
+            factor = to_kg * to_volume / density.factor
+        factors = self._factors[key] = (factor, 1.0 / factor, api)
+        return factors
+
     @classmethod
     def ToVolume(self, Mass, MassUnits, Density, DensityUnits, VolumeUnits):
         """
@@ -270,15 +1046,14 @@ class OilQuantityConverter:
         :param VolumeUnits: units of volume desired
 
         """
-        Density = convert("Density", DensityUnits, "kg/m^3", Density)
-        #print "Density in kg/m^3", Density
-        Mass = convert("Mass", MassUnits, "kg", Mass)
-        #print "Mass in kg", Mass
-        Volume = Mass / Density
-        #print "Volume in m^3", Volume
-        Volume = convert("Volume", "m^3", VolumeUnits, Volume)
-        #print "Volume in %s"%VolumeUnits, Volume
-        return Volume
+        factor, inverse, api = self._Factors(MassUnits, DensityUnits, VolumeUnits)
+        if _is_array(Mass) or _is_array(Density):
+            Mass = _as_float_array(Mass)
+            Density = _as_float_array(Density)
+        if api:
+            return factor * Mass * (Density + 131.5)
+        return factor * Mass / Density
+
     @classmethod
     def ToMass(self, Volume, VolUnits, Density, DensityUnits, MassUnits):
         """
@@ -290,46 +1065,312 @@ class OilQuantityConverter:
         :param DensityUnits: units of density
         :param MassUnits: unit of mass desired for output
         """
+        factor, inverse, api = self._Factors(MassUnits, DensityUnits, VolUnits)
+        if _is_array(Volume) or _is_array(Density):
+            Volume = _as_float_array(Volume)
+            Density = _as_float_array(Density)
+        if api:
+            return inverse * Volume / (Density + 131.5)
+        return inverse * Volume * Density
+
+class SlickVolumeConverter:
+    """
+    class for oil slick volume -- thickness (an "Oil Concentration") times
+    area
 
-        Density = convert("Density", DensityUnits, "kg/m^3", Density)
-        #print "Density in kg/m^3", Density
-        Volume = convert("Volume", VolUnits, "m^3", Volume)
-        #print "Volume in m^3", Volume
-        Mass = Volume * Density
-        #print "Mass in kg", Mass
-        Mass = convert("Mass", "kg", MassUnits,  Mass)
-        #print "Mass in %s"%MassUnits, Mass
-        return Mass
-
-# create the converter objects
-Converters = {}
-for (unittype,data) in ConvertDataUnits.items():
-    if unittype.lower() == 'temperature':
-        Converters["temperature"] = TempConverterClass(unittype, data)
-    elif unittype.lower() == 'density':
-        Converters["density"] = DensityConverterClass(unittype, data)
-    else:
-        Converters[Simplify(unittype)] = ConverterClass(unittype, data)
+    The thickness (or volume) and area can be scalars, or numpy arrays (or
+    sequences) that broadcast together -- e.g. a thickness for each of an
+    array of polygon areas.
+    """
+    _factors = {}
+
+    MICRON = 1e-6 # meters -- the base unit of Oil Concentration
+
+    @classmethod
+    def _Factors(self, ThicknessUnits, AreaUnits, VolumeUnits):
+        """
+        returns (factor, inverse) for the given units, such that:
+
+        Volume = factor * Thickness * Area
+        Thickness = inverse * Volume / Area
 
-def convert(UnitType, FromUnit, ToUnit, Value):
+        The factors are cached for each set of units.
+        """
+        key = (ThicknessUnits, AreaUnits, VolumeUnits)
+        try:
+            return self._factors[key]
+        except KeyError:
+            pass
+        to_micron = get_converter("Oil Concentration", ThicknessUnits, "micron").factor
+        to_m2 = get_converter("Area", AreaUnits, "m^2").factor
+        to_volume = get_converter("Volume", "m^3", VolumeUnits).factor
+        factor = to_micron * self.MICRON * to_m2 * to_volume
+        factors = self._factors[key] = (factor, 1.0 / factor)
+        return factors
+
+    @classmethod
+    def ToVolume(self, Thickness, ThicknessUnits, Area, AreaUnits, VolumeUnits):
+        """
+        Convert slick thickness and area to Volume
+
+        :param Thickness: thickness of the oil
+        :param ThicknessUnits: units of thickness -- any Oil Concentration unit
+        :param Area: area of the slick
+        :param AreaUnits: units of area
+        :param VolumeUnits: units of volume desired
+        """
+        factor, inverse = self._Factors(ThicknessUnits, AreaUnits, VolumeUnits)
+        if _is_array(Thickness) or _is_array(Area):
+            Thickness = _as_float_array(Thickness)
+            Area = _as_float_array(Area)
+        return factor * Thickness * Area
+
+    @classmethod
+    def ToThickness(self, Volume, VolumeUnits, Area, AreaUnits, ThicknessUnits):
+        """
+        Convert a volume of oil spread over an area to thickness
+
+        :param Volume: volume of the oil
+        :param VolumeUnits: units of volume
+        :param Area: area of the slick
+        :param AreaUnits: units of area
+        :param ThicknessUnits: units of thickness desired -- any Oil Concentration unit
+        """
+        factor, inverse = self._Factors(ThicknessUnits, AreaUnits, VolumeUnits)
+        if _is_array(Volume) or _is_array(Area):
+            Volume = _as_float_array(Volume)
+            Area = _as_float_array(Area)
+        return inverse * Volume / Area
+
+# the converter objects -- created when first used
+class _ConverterDict(dict):
+    """
+    dict of the converter objects, keyed by the simplified unit type name
+
+    Each converter is created the first time it is looked up. Anything
+    that needs all of them (iterating, etc.) creates them all.
+    """
+    special_classes = {"temperature": TempConverterClass,
+                       "density": DensityConverterClass,
+                       }
+
+    def __init__(self, UnitData):
+        dict.__init__(self)
+        self.UnitData = UnitData
+        self.TypeNames = dict([(Simplify(unittype), unittype) for unittype in UnitData])
+
+    def __missing__(self, key):
+        unittype = self.TypeNames[key] # raises the KeyError if it's not there
+        Class = self.special_classes.get(key, ConverterClass)
+        Converter = self[key] = Class(unittype, self.UnitData[unittype])
+        return Converter
+
+    def load_all(self):
+        for key in self.TypeNames:
+            self[key]
+
+    def __contains__(self, key):
+        return key in self.TypeNames
+
+    has_key = __contains__
+
+    def __len__(self):
+        return len(self.TypeNames)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        self.load_all()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def iterkeys(self):
+        self.load_all()
+        return dict.iterkeys(self)
+
+    def itervalues(self):
+        self.load_all()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self.load_all()
+        return dict.iteritems(self)
+
+Converters = _ConverterDict(ConvertDataUnits)
+
+def convert(UnitType, FromUnit, ToUnit, Value, out=None):
     """
-    Convert(FromUnit, ToUnit, Value)
+    Convert(FromUnit, ToUnit, Value, out=None)
 
     returns a new value, in the units of ToUnit.
 
     :param FromUnit: the unit the original value is in
     :param ToUnit: the unit you want the value converted to
     :param Value: the original value
+
+    If Value is a numpy array, list or tuple (or out is given), the
+    conversion is done on the whole array at once (requires numpy).
+    See ConverterClass.ConvertArray.
+
+    If Value is an array.array, memoryview or other buffer, an
+    array.array is returned (numpy is not needed). See
+    UnitConverter.ConvertBuffer.
+
+    :param out: optional array to put the result in
     """
     UnitType= Simplify(UnitType)
     try:
         Converter = Converters[UnitType]
     except:
         raise InvalidUnitTypeError(UnitType)
+    if is_buffer(Value) or is_buffer(out):
+        return get_converter(UnitType, FromUnit, ToUnit).ConvertBuffer(Value, out)
+    if out is not None or _is_array(Value):
+        return Converter.ConvertArray(FromUnit, ToUnit, Value, out)
     return Converter.Convert(FromUnit, ToUnit, Value )
     
 Convert = convert # so to have the old, non-PEP8 compatible name
 
+def convert_column(unit_type, values, units, to_unit, categories=None, out=None):
+    """
+    convert_column(unit_type, values, units, to_unit, categories=None, out=None)
+
+    converts an array of values, each in its own unit, to to_unit, all at once.
+
+    :param unit_type: the type of unit: "mass", "length", etc.
+    :param values: the original values
+    :param units: integer array of the unit of each value: the unit IDs
+                  (see ConverterClass.UnitID) or indexes into categories.
+                  Can also be a pandas Categorical, or an array of unit names.
+    :param to_unit: the unit you want all the values converted to
+    :param categories: optional sequence of unit names that units indexes into
+    :param out: optional array to put the result in
+
+    returns (result, valid): valid is a boolean array that is False where
+    the unit is not valid -- the result is NaN there.
+
+    See ConverterClass.ConvertColumn
+    """
+    try:
+        Converter = Converters[Simplify(unit_type)]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+    return Converter.ConvertColumn(values, units, to_unit, categories, out)
+
+def resolve_units(unit_type, units):
+    """
+    resolve_units(unit_type, units)
+
+    finds the unit IDs for a whole array of unit names, looking up each
+    distinct name only once.
+
+    :param unit_type: the type of unit: "mass", "length", etc.
+    :param units: array or sequence of unit names
+
+    returns (codes, valid, unresolved) -- see ConverterClass.ResolveUnits
+    """
+    try:
+        Converter = Converters[Simplify(unit_type)]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+    return Converter.ResolveUnits(units)
+
+_converter_cache = {}
+def get_converter(unit_type, from_unit, to_unit):
+    """
+    get_converter(unit_type, from_unit, to_unit)
+
+    returns a UnitConverter: a callable that converts values from
+    from_unit to to_unit.
+
+    All the name lookup is done once, up front, so this is the way to go
+    if you need to do the same conversion many times:
+
+        to_knots = get_converter("Velocity", "m/s", "knots")
+        speeds = [to_knots(s) for s in speeds_in_mps]
+
+    The handles are cached, so calling this again with the same units
+    returns the same object.
+
+    :param unit_type: the type of unit: "mass", "length", etc.
+    :param from_unit: the unit the original values will be in
+    :param to_unit: the unit you want the values converted to
+    """
+    key = (unit_type, from_unit, to_unit)
+    try:
+        return _converter_cache[key]
+    except KeyError:
+        pass
+    try:
+        Converter = Converters[Simplify(unit_type)]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+    handle = Converter.GetConverter(from_unit, to_unit)
+    # re-use an existing handle for the same units under different names
+    handle = _converter_cache.setdefault(handle._key(), handle)
+    _converter_cache[key] = handle
+    return handle
+
+def convert_in_place(unit_type, from_unit, to_unit, values, dtype=None,
+                     chunk_size=IN_PLACE_CHUNK_SIZE):
+    """
+    convert_in_place(unit_type, from_unit, to_unit, values, dtype=None,
+                     chunk_size=IN_PLACE_CHUNK_SIZE)
+
+    converts a numpy array, numpy.memmap or writable buffer in place, a
+    chunk at a time -- see UnitConverter.ConvertInPlace
+
+    returns values
+    """
+    return get_converter(unit_type, from_unit, to_unit).ConvertInPlace(values, dtype, chunk_size)
+
+def convert_file_in_place(unit_type, from_unit, to_unit, filename, dtype="float64",
+                          offset=0, chunk_size=IN_PLACE_CHUNK_SIZE):
+    """
+    convert_file_in_place(unit_type, from_unit, to_unit, filename,
+                          dtype="float64", offset=0, chunk_size=IN_PLACE_CHUNK_SIZE)
+
+    converts a raw binary file of floats in place.
+
+    Only chunk_size values are memory mapped at a time -- each chunk is
+    converted, flushed, and unmapped before the next, so the memory used
+    doesn't depend on the size of the file.
+
+    :param dtype: the type of the values in the file, e.g. "float32", ">f8"
+    :param offset: the number of bytes before the values (a header)
+
+    returns the number of values converted
+    """
+    _require_numpy()
+    handle = get_converter(unit_type, from_unit, to_unit)
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise TypeError("only floating point values can be converted in place")
+    size = (os.path.getsize(filename) - offset) // dtype.itemsize
+    for start in range(0, size, chunk_size):
+        count = min(chunk_size, size - start)
+        chunk = np.memmap(filename, dtype=dtype, mode="r+",
+                          offset=offset + start * dtype.itemsize, shape=(count,))
+        handle._convert_array(chunk, chunk)
+        chunk.flush()
+        del chunk
+    return size
+
 ### This is used by TapInput
 
 
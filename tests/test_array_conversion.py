@@ -0,0 +1,531 @@
+#!/usr/bin/env python
+
+"""
+tests for the array (numpy) conversion code
+
+designed to be run with pytest:
+
+py.test test_array_conversion.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy import unit_conversion
+from hazpy.unit_conversion.unit_data import ConvertDataUnits
+
+# values that are valid for every unit type -- including API gravity
+Values = [0.5, 1.0, 10.0, 25.7222, 100.0, 1234.5]
+
+
+def all_unit_pairs():
+    for unit_type, units in sorted(ConvertDataUnits.items()):
+        names = sorted(units.keys())
+        for from_unit in names:
+            for to_unit in names:
+                yield unit_type, from_unit, to_unit
+
+
+@pytest.mark.parametrize(("unit_type", "from_unit", "to_unit"), list(all_unit_pairs()))
+def test_array_matches_scalar(unit_type, from_unit, to_unit):
+    expected = [unit_conversion.convert(unit_type, from_unit, to_unit, v) for v in Values]
+    result = unit_conversion.convert(unit_type, from_unit, to_unit, np.array(Values))
+
+    assert np.allclose(result, expected, rtol=1e-14, atol=0)
+
+
+def test_array_keeps_shape():
+    values = np.arange(12.0).reshape((3, 4))
+    result = unit_conversion.convert("Length", "m", "ft", values)
+
+    assert result.shape == (3, 4)
+    assert np.allclose(result, values / 0.3048)
+
+
+def test_array_keeps_float32():
+    values = np.arange(10, dtype=np.float32)
+    result = unit_conversion.convert("Temperature", "C", "F", values)
+
+    assert result.dtype == np.float32
+
+
+def test_array_int_to_float():
+    result = unit_conversion.convert("Mass", "kg", "g", np.arange(5))
+
+    assert result.dtype == np.float64
+    assert np.array_equal(result, [0.0, 1000.0, 2000.0, 3000.0, 4000.0])
+
+
+def test_list_input():
+    result = unit_conversion.convert("Time", "hr", "min", [1, 2, 3])
+
+    assert isinstance(result, np.ndarray)
+    assert np.array_equal(result, [60.0, 120.0, 180.0])
+
+
+def test_out_buffer():
+    values = np.array([1.0, 2.0, 3.0])
+    out = np.empty_like(values)
+    result = unit_conversion.convert("Volume", "bbl", "gal", values, out=out)
+
+    assert result is out
+    assert np.allclose(out, [42.0, 84.0, 126.0])
+
+
+@pytest.mark.parametrize(("unit_type", "from_unit", "to_unit"),
+                         [("Length", "m", "ft"),
+                          ("Temperature", "F", "K"),
+                          ("Density", "API", "kg/m^3"),
+                          ("Density", "SG", "API"),
+                          ])
+def test_in_place(unit_type, from_unit, to_unit):
+    values = np.array(Values)
+    expected = unit_conversion.convert(unit_type, from_unit, to_unit, values)
+    unit_conversion.convert(unit_type, from_unit, to_unit, values, out=values)
+
+    assert np.allclose(values, expected, rtol=1e-14)
+
+
+def test_array_bad_unit():
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.convert("length", "flintstones", "meters", np.ones(3))
+
+
+@pytest.mark.parametrize(("unit_type", "from_unit", "to_unit"),
+                         [("Length", "m", "ft"),
+                          ("Temperature", "F", "C"),
+                          ("Density", "API", "API"),
+                          ("Density", "kg/m^3", "API"),
+                          ])
+def test_handle_array(unit_type, from_unit, to_unit):
+    handle = unit_conversion.get_converter(unit_type, from_unit, to_unit)
+    values = np.array(Values)
+
+    assert np.allclose(handle(values),
+                       unit_conversion.convert(unit_type, from_unit, to_unit, values),
+                       rtol=1e-14, atol=0)
+
+
+@pytest.mark.parametrize("unit_type", sorted(ConvertDataUnits.keys()))
+def test_factor_matrix(unit_type):
+    Converter = unit_conversion.Converters[unit_conversion.Simplify(unit_type)]
+    N = len(Converter.UnitNames)
+    if unit_type == "Temperature":
+        scale, offset = Converter.AffineMatrices()
+        assert scale.shape == offset.shape == (N, N)
+        assert np.array_equal(scale, Converter.Scales)
+        assert np.array_equal(offset, Converter.Offsets)
+        assert Converter.FactorMatrix() is scale
+    else:
+        assert Converter.FactorMatrix().shape == (N, N)
+        assert np.array_equal(Converter.FactorMatrix(), Converter.Factors)
+    # the diagonal is always the identity
+    assert np.allclose(np.diag(Converter.FactorMatrix()), 1.0, rtol=1e-15)
+
+
+def test_factor_matrix_gather():
+    Converter = unit_conversion.Converters["length"]
+    from_ids = np.array([Converter.UnitID(u) for u in ("m", "ft", "km", "ft")])
+    values = np.array([1.0, 1.0, 2.0, 3.0])
+    result = values * Converter.FactorMatrix()[from_ids, Converter.UnitID("ft")]
+
+    assert np.allclose(result, [1 / 0.3048, 1.0, 2000 / 0.3048, 3.0])
+
+
+## mixed unit columns
+
+@pytest.mark.parametrize("unit_type", sorted(ConvertDataUnits.keys()))
+def test_convert_column_matches_scalar(unit_type):
+    names = sorted(ConvertDataUnits[unit_type].keys())
+    units = [names[i % len(names)] for i in range(3 * len(names))]
+    values = [Values[i % len(Values)] for i in range(len(units))]
+    to_unit = names[0]
+    expected = [unit_conversion.convert(unit_type, unit, to_unit, value)
+                for unit, value in zip(units, values)]
+
+    Converter = unit_conversion.Converters[unit_conversion.Simplify(unit_type)]
+    codes = np.array([Converter.UnitID(unit) for unit in units])
+    result, valid = unit_conversion.convert_column(unit_type, values, codes, to_unit)
+
+    assert valid.all()
+    assert np.allclose(result, expected, rtol=1e-14, atol=1e-12)
+
+
+def test_convert_column_categories():
+    values = np.array([1.0, 1.0, 2.0, 42.0, 5.0])
+    codes = np.array([0, 1, 1, 2, 0])
+    categories = ["bbl", "m^3", "gal"]
+    result, valid = unit_conversion.convert_column("Volume", values, codes, "bbl", categories)
+
+    assert valid.all()
+    assert np.allclose(result, [1.0, 6.2898108, 12.5796216, 1.0, 5.0])
+
+
+def test_convert_column_invalid():
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    codes = np.array([0, 1, -1, 2, 7])
+    categories = ["ft", "flintstones", "m"]
+    result, valid = unit_conversion.convert_column("Length", values, codes, "ft", categories)
+
+    assert valid.tolist() == [True, False, False, True, False]
+    assert np.isnan(result[~valid]).all()
+    assert np.allclose(result[valid], [1.0, 4.0 / 0.3048])
+
+
+def test_convert_column_temperature():
+    values = np.array([32.0, 0.0, 273.16, 212.0], dtype=np.float32)
+    Converter = unit_conversion.Converters["temperature"]
+    codes = np.array([Converter.UnitID(u) for u in ("F", "C", "K", "F")])
+    result, valid = unit_conversion.convert_column("Temperature", values, codes, "C")
+
+    assert result.dtype == np.float32
+    assert np.allclose(result, [0.0, 0.0, 0.0, 100.0], atol=1e-4)
+
+
+def test_convert_column_api():
+    values = np.array([10.0, 1.0, 25.7222, 999.13])
+    codes = np.array([0, 1, 0, 2])
+    categories = ["API", "SG", "kg/m^3"]
+    result, valid = unit_conversion.convert_column("Density", values, codes, "API", categories)
+
+    assert valid.all()
+    assert np.allclose(result, [10.0, 10.0, 25.7222, 10.0])
+
+    result, valid = unit_conversion.convert_column("Density", values, codes, "SG", categories)
+    assert np.allclose(result, [1.0, 1.0, 0.9, 1.0])
+
+
+def test_convert_column_out():
+    values = np.array([1.0, 2.0])
+    Converter = unit_conversion.Converters["length"]
+    codes = np.array([Converter.UnitID("km"), Converter.UnitID("m")])
+    result, valid = unit_conversion.convert_column("Length", values, codes, "m", out=values)
+
+    assert result is values
+    assert np.array_equal(values, [1000.0, 2.0])
+
+
+class FakeCategorical(object):
+    # quacks like a pandas Categorical
+    def __init__(self, codes, categories):
+        self.codes = np.array(codes, dtype=np.int8)
+        self.categories = categories
+
+
+def test_convert_column_categorical():
+    units = FakeCategorical([0, 1, -1], ["hr", "min"])
+    result, valid = unit_conversion.convert_column("Time", [1.0, 30.0, 1.0], units, "min")
+
+    assert valid.tolist() == [True, True, False]
+    assert np.array_equal(result[:2], [60.0, 30.0])
+
+
+def test_convert_column_bad_codes():
+    with pytest.raises(TypeError):
+        unit_conversion.convert_column("Time", [1.0], [0.5], "min")
+
+
+## bulk unit name resolution
+
+def test_resolve_units():
+    Converter = unit_conversion.Converters["volume"]
+    units = ["Barrels", "bbl", " BBLS ", "gal", "spam", "bbl", "eggs", "m^3"]
+    for column in (units, np.array(units), np.array(units, dtype=object)):
+        codes, valid, unresolved = unit_conversion.resolve_units("Volume", column)
+
+        bbl = Converter.UnitID("bbl")
+        assert codes.tolist() == [bbl, bbl, bbl, Converter.UnitID("gal"), -1,
+                                  bbl, -1, Converter.UnitID("m^3")]
+        assert valid.tolist() == [True, True, True, True, False, True, False, True]
+        assert sorted(unresolved) == ["eggs", "spam"]
+
+
+def test_resolve_units_missing():
+    codes, valid, unresolved = unit_conversion.resolve_units("Mass", ["kg", None, float("nan"), "lb"])
+
+    assert valid.tolist() == [True, False, False, True]
+    assert None in unresolved
+    assert len(unresolved) == 2
+
+
+def test_resolve_units_shape():
+    codes, valid, unresolved = unit_conversion.resolve_units("Time", np.array([["s", "min"], ["hr", "s"]]))
+
+    assert codes.shape == valid.shape == (2, 2)
+    assert unresolved == []
+
+
+def test_convert_column_unit_names():
+    result, valid = unit_conversion.convert_column("Volume", [1.0, 1.0, 1.0],
+                                                   ["bbl", " Gallons", "spam"], "gal")
+
+    assert valid.tolist() == [True, True, False]
+    assert np.allclose(result[:2], [42.0, 1.0])
+
+
+## temperature
+
+def temperature_names():
+    names = []
+    for name, (coeffs, synonyms) in ConvertDataUnits["Temperature"].items():
+        names.append(name)
+        names.extend(synonyms)
+    return names
+
+
+def test_temperature_array_identical_to_scalar():
+    values = np.linspace(-300.0, 500.0, 1001)
+    for from_unit in temperature_names():
+        for to_unit in temperature_names():
+            expected = [unit_conversion.convert("Temperature", from_unit, to_unit, v)
+                        for v in values]
+            result = unit_conversion.convert("Temperature", from_unit, to_unit, values)
+            assert np.array_equal(result, expected)
+
+
+def test_temperature_float32():
+    values = np.array([-2.0, 0.0, 15.5, 30.0], dtype=np.float32)
+    handle = unit_conversion.get_converter("Temperature", "C", "K")
+
+    assert handle(values).dtype == np.float32
+    assert handle(values, dtype=np.float64).dtype == np.float64
+    assert handle(values.astype(np.float64), dtype=np.float32).dtype == np.float32
+    assert np.allclose(handle(values), values.astype(np.float64) + 273.16)
+
+
+def test_temperature_in_place():
+    values = np.array([[32.0, 212.0], [-40.0, 50.0]], dtype=np.float32)
+    result = unit_conversion.get_converter("Temperature", "F", "C")(values, out=values)
+
+    assert result is values
+    assert np.allclose(values, [[0.0, 100.0], [-40.0, 10.0]], atol=1e-5)
+
+
+def test_temperature_zero_exact():
+    assert unit_conversion.convert("Temperature", "F", "C", np.array([32.0]))[0] == 0.0
+    assert unit_conversion.convert("Temperature", "K", "C", np.array([273.16]))[0] == 0.0
+    assert unit_conversion.convert("Temperature", "C", "K", np.array([0.0]))[0] == 273.16
+
+
+## density and API gravity
+
+def density_names():
+    names = []
+    for name, (factor, synonyms) in ConvertDataUnits["Density"].items():
+        names.append(name)
+        names.extend(synonyms)
+    return names
+
+
+def test_density_array_identical_to_scalar():
+    values = np.linspace(0.5, 80.0, 200)
+    for from_unit in density_names():
+        for to_unit in density_names():
+            expected = [unit_conversion.convert("Density", from_unit, to_unit, v)
+                        for v in values]
+            result = unit_conversion.convert("Density", from_unit, to_unit, values)
+            assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit", "values", "expected"),
+                         [("API", "SG", [10.0, 25.7222], [1.0, 0.9]),
+                          ("SG", "API", [1.0, 0.9, 2.0], [10.0, 25.7222, -60.75]),
+                          ("API", "kg/m^3", [10.0], [999.13]),
+                          ("kg/m^3", "API", [999.13], [10.0]),
+                          ("API", "API", [-20.0, 10.0, 45.5], [-20.0, 10.0, 45.5]),
+                          ])
+def test_api_known_values(from_unit, to_unit, values, expected):
+    result = unit_conversion.convert("Density", from_unit, to_unit, np.array(values))
+
+    assert np.allclose(result, expected, rtol=1e-5)
+
+
+def test_api_mask():
+    handle = unit_conversion.get_converter("Density", "API", "SG")
+    result, valid = handle.ConvertWithMask([10.0, -131.5, -200.0, np.nan, 25.7222])
+
+    assert valid.tolist() == [True, False, False, False, True]
+    assert np.isnan(result[~valid]).all()
+    assert np.allclose(result[valid], [1.0, 0.9], rtol=1e-5)
+
+
+def test_to_api_mask():
+    handle = unit_conversion.get_converter("Density", "kg/m^3", "API")
+    result, valid = handle.ConvertWithMask([999.13, 0.0, -5.0])
+
+    assert valid.tolist() == [True, False, False]
+    assert np.allclose(result[0], 10.0)
+    assert np.isnan(result[1:]).all()
+
+
+def test_api_mask_in_place():
+    values = np.array([10.0, -131.5])
+    handle = unit_conversion.get_converter("Density", "API", "SG")
+    result, valid = handle.ConvertWithMask(values, out=values)
+
+    assert result is values
+    assert valid.tolist() == [True, False]
+
+
+def test_linear_mask():
+    handle = unit_conversion.get_converter("Length", "m", "ft")
+    result, valid = handle.ConvertWithMask([1.0, np.inf, -1.0])
+
+    assert valid.tolist() == [True, False, True]
+
+
+def test_convert_column_api_mask():
+    values = np.array([10.0, -131.5, 1.0, 0.0, 10.0])
+    units = ["API", "API", "SG", "SG", "API"]
+    result, valid = unit_conversion.convert_column("Density", values, units, "API")
+
+    assert valid.tolist() == [True, False, True, False, True]
+    assert np.allclose(result[valid], [10.0, 10.0, 10.0])
+
+    result, valid = unit_conversion.convert_column("Density", values, units, "SG")
+    assert valid.tolist() == [True, False, True, True, True]
+    assert np.allclose(result[valid], [1.0, 1.0, 0.0, 1.0])
+
+
+## oil quantity
+
+OQC = unit_conversion.OilQuantityConverter
+
+
+@pytest.mark.parametrize(("density", "density_units"),
+                         [([25.0, 10.0, 40.0], "API"),
+                          ([0.816, 0.9, 0.99], "SG"),
+                          ([816.0, 900.0, 990.0], "kg/m^3"),
+                          ])
+def test_to_volume_array(density, density_units):
+    mass = np.array([1.0, 2.0, 3.5])
+    result = OQC.ToVolume(mass, "metricton", np.array(density), density_units, "bbl")
+    expected = [OQC.ToVolume(m, "metricton", d, density_units, "bbl")
+                for m, d in zip(mass, density)]
+
+    assert np.allclose(result, expected, rtol=1e-14)
+
+    back = OQC.ToMass(result, "bbl", np.array(density), density_units, "metricton")
+    assert np.allclose(back, mass, rtol=1e-14)
+
+
+def test_to_volume_broadcast():
+    mass = np.array([[1.0], [2.0]])
+    density = np.array([0.8, 0.9, 1.0])
+    result = OQC.ToVolume(mass, "kg", density, "g/cm^3", "l")
+
+    assert result.shape == (2, 3)
+    assert np.allclose(result, [[1.25, 1.0 / 0.9, 1.0], [2.5, 2.0 / 0.9, 2.0]])
+
+
+def test_to_mass_scalar_density():
+    volume = [1.0, 10.0]
+    result = OQC.ToMass(volume, "m^3", 900.0, "kg/m^3", "kg")
+
+    assert np.allclose(result, [900.0, 9000.0])
+
+
+## slick volume
+
+SVC = unit_conversion.SlickVolumeConverter
+
+
+def test_slick_volume_array():
+    thickness = np.array([1.0, 0.5, 10.0])
+    area = np.array([2.0, 30.0, 0.25])
+    result = SVC.ToVolume(thickness, "bbl/acre", area, "sq nm", "gal")
+    expected = [unit_conversion.convert("Volume", "m^3", "gal",
+                                        unit_conversion.convert("Oil Concentration", "bbl/acre", "micron", t) * 1e-6 *
+                                        unit_conversion.convert("Area", "sq nm", "m^2", a))
+                for t, a in zip(thickness, area)]
+
+    assert np.allclose(result, expected, rtol=1e-12)
+
+    back = SVC.ToThickness(result, "gal", area, "sq nm", "bbl/acre")
+    assert np.allclose(back, thickness, rtol=1e-14)
+
+
+def test_slick_volume_broadcast():
+    result = SVC.ToVolume([[1.0], [2.0]], "micron", [1.0, 2.0, 3.0], "km^2", "m^3")
+
+    assert result.shape == (2, 3)
+    assert np.allclose(result, [[1.0, 2.0, 3.0], [2.0, 4.0, 6.0]])
+
+
+## in-place conversion
+
+def test_convert_in_place():
+    values = np.array([[32.0, 212.0], [-40.0, np.nan]])
+    result = unit_conversion.convert_in_place("Temperature", "F", "C", values, chunk_size=3)
+
+    assert result is values
+    assert np.allclose(values[0], [0.0, 100.0])
+    assert np.isnan(values[1, 1])
+
+
+def test_convert_in_place_buffers():
+    import array
+    doubles = array.array("d", [1.0, 2.5])
+    unit_conversion.convert_in_place("Length", "m", "cm", doubles)
+    assert doubles.tolist() == [100.0, 250.0]
+
+    floats = array.array("f", [1.0, 2.0])
+    unit_conversion.convert_in_place("Length", "m", "cm", floats)
+    assert floats.tolist() == [100.0, 200.0]
+
+    data = bytearray(np.array([1.0, 2.0], dtype=np.float32).tobytes())
+    unit_conversion.convert_in_place("Length", "m", "cm", data, dtype="float32")
+    assert np.frombuffer(data, dtype=np.float32).tolist() == [100.0, 200.0]
+
+
+def test_convert_in_place_errors():
+    import array
+    with pytest.raises(TypeError):
+        unit_conversion.convert_in_place("Length", "m", "cm", np.arange(3))
+    for typecode in "li":
+        values = array.array(typecode, [10, 20])
+        with pytest.raises(TypeError):
+            unit_conversion.convert_in_place("Temperature", "C", "K", values)
+        assert values.tolist() == [10, 20]
+    with pytest.raises(TypeError):
+        unit_conversion.convert_in_place("Length", "m", "ft", memoryview(np.arange(3)))
+    values = np.ones(3)
+    values.flags.writeable = False
+    with pytest.raises(ValueError):
+        unit_conversion.convert_in_place("Length", "m", "cm", values)
+
+
+def test_convert_in_place_strided():
+    values = np.arange(12.0).reshape(3, 4)
+    unit_conversion.convert_in_place("Length", "m", "cm", values[:, ::2], chunk_size=2)
+
+    assert values[:, ::2].tolist() == [[0.0, 200.0], [400.0, 600.0], [800.0, 1000.0]]
+    assert values[:, 1::2].tolist() == [[1.0, 3.0], [5.0, 7.0], [9.0, 11.0]]
+
+
+def test_convert_file_in_place(tmpdir):
+    filename = str(tmpdir.join("depths.bin"))
+    header = b"HDR0" * 4
+    with open(filename, "wb") as outfile:
+        outfile.write(header)
+        outfile.write(np.arange(10, dtype=np.float32).tobytes())
+
+    count = unit_conversion.convert_file_in_place("Length", "m", "cm", filename, dtype="float32",
+                                                  offset=len(header), chunk_size=3)
+
+    assert count == 10
+    with open(filename, "rb") as infile:
+        data = infile.read()
+    assert data[:len(header)] == header
+    assert np.frombuffer(data[len(header):], dtype=np.float32).tolist() == [i * 100.0 for i in range(10)]
+
+
+def test_convert_memmap_in_place(tmpdir):
+    filename = str(tmpdir.join("temps.npy"))
+    values = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float64, shape=(5,))
+    values[:] = [32.0, 50.0, 68.0, 86.0, 104.0]
+    unit_conversion.convert_in_place("Temperature", "F", "C", values, chunk_size=2)
+    del values
+
+    assert np.allclose(np.lib.format.open_memmap(filename, mode="r"), [0.0, 10.0, 20.0, 30.0, 40.0])
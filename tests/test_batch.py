@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""
+tests for converting batches of files
+
+designed to be run with pytest:
+
+py.test test_batch.py
+"""
+
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy.unit_conversion import batch
+from hazpy.unit_conversion.batch import BatchSpec, run_batch
+
+CSV = b"Time (s),Depth (ft)\n0,10\n1,20\n2,\n"
+
+
+@pytest.fixture
+def files(tmpdir):
+    indir = tmpdir.mkdir("in")
+    for i in range(4):
+        indir.join("day%i.csv" % i).write_binary(CSV)
+    np.save(str(indir.join("temps.npy")), np.array([[32.0, 212.0], [-40.0, np.nan]]))
+    return sorted(str(f) for f in indir.listdir())
+
+
+def test_spec_pickles():
+    spec = BatchSpec(columns=[("Depth (ft)", "Length", "ft", "m")], unit_system="SI",
+                     array=("Temperature", "F", "C"))
+    spec2 = pickle.loads(pickle.dumps(spec, 2))
+    assert spec2.key() == spec.key()
+    assert len(pickle.dumps(spec, 2)) < 500
+
+
+def test_run_batch(files, tmpdir):
+    outdir = str(tmpdir.join("out"))
+    spec = BatchSpec(unit_system="SI", array=("Temperature", "F", "C"))
+    summary = run_batch(files, outdir, spec, workers=1)
+
+    assert len(summary.converted) == 5
+    assert summary.failed == []
+    assert summary.rows == 4 * 3 + 4
+    assert summary.invalid == 4 * 1 + 1
+    assert tmpdir.join("out", "day0.csv").read_binary() == b"Time (s),Depth (m)\n0,3.048\n1,6.096\n2,\n"
+    temps = np.load(str(tmpdir.join("out", "temps.npy")))
+    assert np.allclose(temps[0], [0.0, 100.0])
+    assert temps[1, 0] == pytest.approx(-40.0)
+    assert np.isnan(temps[1, 1])
+    assert "5 files converted" in str(summary)
+
+
+def test_failures(files, tmpdir):
+    # no array conversion for the .npy file
+    summary = run_batch(files, str(tmpdir.join("out")), BatchSpec(unit_system="US"), workers=1)
+    assert len(summary.converted) == 4
+    assert [f for f, error in summary.failed] == [files[-1]]
+    assert "ValueError" in summary.failed[0][1]
+
+
+def test_resume(files, tmpdir):
+    outdir = str(tmpdir.join("out"))
+    progress = str(tmpdir.join("progress.txt"))
+    spec = BatchSpec(unit_system="SI")
+    summary = run_batch(files[:2], outdir, spec, workers=1, progress_file=progress)
+    assert len(summary.converted) == 2
+
+    summary = run_batch(files, outdir, spec, workers=1, progress_file=progress)
+    assert summary.skipped == files[:2]
+    assert summary.converted == files[2:4]
+    assert len(summary.failed) == 1
+    # the failed one is not recorded
+    assert batch.read_progress(progress) == set(files[:4])
+
+
+def test_output_dir_is_input_dir(files, tmpdir):
+    with pytest.raises(ValueError):
+        run_batch(files, str(tmpdir.join("in")), BatchSpec(), workers=1)
+
+
+def test_same_file_names(tmpdir):
+    infiles = []
+    for name in ("a", "b"):
+        infile = tmpdir.mkdir(name).join("day.csv")
+        infile.write_binary(CSV)
+        infiles.append(str(infile))
+    outdir = tmpdir.join("out")
+    with pytest.raises(ValueError):
+        run_batch(infiles, str(outdir), BatchSpec(unit_system="SI"), workers=2)
+    # nothing was done
+    assert not outdir.check()
+
+
+def test_convert_npy_fortran(tmpdir):
+    values = np.asfortranarray(np.arange(12.0).reshape(3, 4))
+    infile, outfile = str(tmpdir.join("in.npy")), str(tmpdir.join("out.npy"))
+    np.save(infile, values)
+    handle = batch.get_converter("Length", "m", "cm")
+    assert batch.convert_npy(handle, infile, outfile, chunk_size=5) == (12, 0)
+    assert np.array_equal(np.load(outfile), values * 100)
+
+
+def test_process_pool(files, tmpdir):
+    pytest.importorskip("concurrent.futures")
+    outdir = str(tmpdir.join("out"))
+    spec = BatchSpec(columns=[("Depth (ft)", None, "ft", "cm")], array=("Temperature", "F", "K"))
+    summary = run_batch(files, outdir, spec, workers=2)
+
+    assert sorted(summary.converted) == files
+    assert tmpdir.join("out", "day3.csv").read_binary().splitlines()[1] == b"0,304.8"
+    expected = batch.get_converter("Temperature", "F", "K")(32.0)
+    assert np.load(str(tmpdir.join("out", "temps.npy")))[0, 0] == pytest.approx(expected)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+tests for converting array.array and other buffers -- these don't need numpy
+
+designed to be run with pytest:
+
+py.test test_buffer_conversion.py
+"""
+
+import array
+import math
+import mmap
+
+import pytest
+
+from hazpy.unit_conversion import convert, get_converter, LatLongConverter
+
+Values = [0.5, 1.0, 10.0, 25.7222, 100.0, 1234.5]
+
+
+@pytest.mark.parametrize(("unit_type", "from_unit", "to_unit"),
+                         [("Length", "meter", "foot"),
+                          ("Temperature", "F", "C"),
+                          ("Density", "API", "kg/m^3"),
+                          ("Density", "g/cm^3", "API"),
+                          ("Density", "API", "API"),
+                          ])
+def test_same_as_scalar(unit_type, from_unit, to_unit):
+    result = convert(unit_type, from_unit, to_unit, array.array("d", Values))
+
+    assert isinstance(result, array.array)
+    assert result.typecode == "d"
+    assert result.tolist() == [convert(unit_type, from_unit, to_unit, v) for v in Values]
+
+
+def test_typecodes():
+    assert convert("Length", "m", "cm", array.array("f", [1.0, 2.0])) == array.array("f", [100.0, 200.0])
+    assert convert("Length", "m", "cm", array.array("i", [1, 2])) == array.array("d", [100.0, 200.0])
+
+
+def test_raw_buffers():
+    data = array.array("d", [1.0, 2.0]).tostring()
+    expected = array.array("d", [100.0, 200.0])
+    assert convert("Length", "m", "cm", bytearray(data)) == expected
+    assert convert("Length", "m", "cm", memoryview(data)) == expected
+    buf = mmap.mmap(-1, len(data))
+    buf[:] = data
+    assert convert("Length", "m", "cm", buf) == expected
+
+
+def test_out():
+    out = array.array("d", [0.0, 0.0])
+    result = convert("Length", "m", "cm", array.array("d", [1.0, 2.0]), out=out)
+    assert result is out
+    assert out.tolist() == [100.0, 200.0]
+
+    out = bytearray(16)
+    get_converter("Length", "m", "cm")(array.array("d", [1.0, 2.0]), out=out)
+    assert array.array("d", bytes(out)).tolist() == [100.0, 200.0]
+
+    with pytest.raises(ValueError):
+        convert("Length", "m", "cm", array.array("d", [1.0]), out=array.array("d", [0.0, 0.0]))
+
+
+def test_handle():
+    handle = get_converter("Length", "m", "cm")
+    assert handle.ConvertBuffer(array.array("d", [1.5])) == array.array("d", [150.0])
+    assert handle(array.array("d", [1.5])) == array.array("d", [150.0])
+
+
+## lat-long
+DecDegrees = [28.2186111111, -92.6244444444, -0.0, 0.1, 179.999999]
+
+
+def test_to_deg_min():
+    degrees, minutes = LatLongConverter.ToDegMinArray(array.array("d", DecDegrees))
+    assert list(zip(degrees, minutes)) == [LatLongConverter.ToDegMin(v) for v in DecDegrees]
+    assert math.copysign(1.0, degrees[2]) == -1.0
+
+
+def test_to_deg_min_sec():
+    degrees, minutes, seconds = LatLongConverter.ToDegMinSecArray(array.array("d", DecDegrees))
+    assert minutes.typecode == "l"
+    assert (list(zip(degrees, minutes, seconds)) ==
+            [LatLongConverter.ToDegMinSec(v) for v in DecDegrees])
+
+
+def test_to_dec_deg():
+    DecDegrees, valid = LatLongConverter.ToDecDegArray(array.array("d", [10, -20, 200]), 30,
+                                                       array.array("d", [0, 36, 0]))
+    assert DecDegrees[:2].tolist() == [10.5, -20.51]
+    assert math.isnan(DecDegrees[2])
+    assert valid.tolist() == [1, 1, 0]
+
+    with pytest.raises(ValueError):
+        LatLongConverter.ToDecDegArray(array.array("d", [10, 200]), strict=True)
+    with pytest.raises(ValueError):
+        LatLongConverter.ToDecDegArray(array.array("d", [10, 20]), array.array("d", [1]))
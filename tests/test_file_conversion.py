@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+"""
+tests for converting columns of CSV files, and the command line
+
+designed to be run with pytest:
+
+py.test test_file_conversion.py
+"""
+
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy.unit_conversion import file_conversion
+from hazpy.unit_conversion.file_conversion import CSVConverter, ColumnConversion
+from hazpy.unit_conversion import __main__ as cli
+from hazpy import unit_conversion
+from hazpy.unit_conversion import InvalidUnitError
+
+CSV = (b"Time,Depth,Speed,Lat,Lon\n"
+       b"0,10,1.0,28.2186111111,-92.6244444444\n"
+       b"1,,2.5,-0.1,0.5\n"
+       b"2,3.5,3,45,180\n")
+
+
+def convert(converter, text=CSV):
+    outfile = io.BytesIO()
+    stats = converter.convert_stream(io.BytesIO(text), outfile)
+    return outfile.getvalue().decode("utf-8").splitlines(), stats
+
+
+def test_convert_columns():
+    converter = CSVConverter([ColumnConversion("Depth", "Length", "ft", "m"),
+                              ColumnConversion("Speed", "Velocity", "m/s", "cm/s")],
+                             chunk_size=2)
+    lines, stats = convert(converter)
+    assert lines == ["Time,Depth,Speed,Lat,Lon",
+                     "0,3.048,100.0,28.2186111111,-92.6244444444",
+                     "1,,250.0,-0.1,0.5",
+                     "2,1.0668,300.0,45,180"]
+    assert stats.rows == 3
+    assert stats.invalid == 1
+    assert stats.rows_per_second > 0
+
+
+def test_format_latlon():
+    converter = CSVConverter([], lat_columns=["Lat"], lon_columns=["Lon"], latlon_style=3)
+    lines, stats = convert(converter)
+    assert lines[1] == u"0,10,1.0,28\xb0 13\u2032 7.00\u2033 North,92\xb0 37\u2032 28.00\u2033 West"
+    assert lines[2].endswith(u"0\xb0 6\u2032 0.00\u2033 South,0\xb0 30\u2032 0.00\u2033 East")
+
+
+def test_output_name():
+    converter = CSVConverter([ColumnConversion("Depth", "Length", "ft", "m", output_name="Depth (m)")])
+    lines, stats = convert(converter)
+    assert lines[0] == "Time,Depth (m),Speed,Lat,Lon"
+
+
+def test_missing_column():
+    converter = CSVConverter([ColumnConversion("Height", "Length", "ft", "m")])
+    with pytest.raises(ValueError):
+        convert(converter)
+
+
+def test_ragged_rows():
+    converter = CSVConverter([ColumnConversion("Depth", "Length", "ft", "m")])
+    lines, stats = convert(converter, b"Time,Depth\n0,10,extra,cells\n1\n2,20\n")
+    # extra cells are kept, short rows are padded
+    assert lines[1:] == ["0,3.048,extra,cells", "1,", "2,6.096"]
+    assert stats.rows == 3
+
+
+def test_empty_file():
+    lines, stats = convert(CSVConverter([]), b"")
+    assert lines == []
+    assert stats.rows == 0
+
+
+def test_spec():
+    conversion = ColumnConversion.from_spec("Depth:Length:ft:m")
+    assert conversion.column == "Depth"
+    assert conversion.handle.from_unit == "foot"
+    conversion = ColumnConversion.from_spec("Speed:m/s:knots")
+    assert conversion.handle.unit_type == "Velocity"
+    with pytest.raises(ValueError):
+        ColumnConversion.from_spec("Depth:ft")
+    with pytest.raises(InvalidUnitError):
+        ColumnConversion.from_spec("Depth:ft:parsecs")
+
+
+def test_parse_floats():
+    values, valid = file_conversion.parse_floats(["1.5", "", " 2", "nan", "x"])
+    assert valid.tolist() == [True, False, True, False, False]
+    assert values[valid].tolist() == [1.5, 2.0]
+
+
+def test_cli(tmpdir):
+    infile = tmpdir.join("in.csv")
+    infile.write_binary(CSV)
+    outfile = tmpdir.join("out.csv")
+    assert cli.main([str(infile), str(outfile), "-c", "Depth:ft:m", "--lat", "Lat", "-q"]) == 0
+    lines = outfile.read_binary().decode("utf-8").splitlines()
+    assert lines[1] == u"0,3.048,1.0,28\xb0 13.12\u2032 North,-92.6244444444"
+
+
+def test_cli_error(tmpdir):
+    infile = tmpdir.join("in.csv")
+    infile.write_binary(CSV)
+    with pytest.raises(SystemExit) as info:
+        cli.main([str(infile), "-", "-c", "Depth:ft:furlongs"])
+    assert info.value.code == 2
+    # files that can't be read or written
+    with pytest.raises(SystemExit) as info:
+        cli.main([str(tmpdir.join("nofile.csv")), "-", "-c", "Depth:ft:m"])
+    assert info.value.code == 2
+    with pytest.raises(SystemExit) as info:
+        cli.main([str(infile), str(tmpdir.join("nodir", "out.csv")), "-c", "Depth:ft:m"])
+    assert info.value.code == 2
+
+
+## units in the column names
+@pytest.mark.parametrize(("column", "expected"),
+                         [("Depth (ft)", ("Length", "ft", (7, 9))),
+                          ("Temp [deg F]", ("Temperature", "deg F", (6, 11))),
+                          ("Release rate ( bbl/day )", ("Discharge", "bbl/day", (15, 22))),
+                          ("Depth", None),
+                          ("Lat (deg)", None),       # not a unit
+                          ("Depth (ft) at noon", None),
+                          ("Temp [deg F)", None),
+                          ])
+def test_header_unit(column, expected):
+    assert file_conversion.header_unit(column) == expected
+
+
+HEADER_CSV = (b"Time (s),Depth (ft),Temp [deg F],Release rate (bbl/day),Lat (deg)\n"
+              b"0,10,32,100,28.5\n"
+              b"3600,,212,50,29\n")
+
+
+def test_plan():
+    header = ["Time (s)", "Depth (ft)", "Temp [deg F]", "Note"]
+    conversions = file_conversion.plan_header_conversions(header, "SI")
+    # time is already in seconds
+    assert [c.column for c in conversions] == ["Depth (ft)", "Temp [deg F]"]
+    assert [c.output_name for c in conversions] == ["Depth (m)", "Temp [C]"]
+    conversions = file_conversion.plan_header_conversions(header, {"Length": "cm"}, exclude=["Depth (ft)"])
+    assert conversions == []
+    with pytest.raises(ValueError):
+        file_conversion.plan_header_conversions(header, "imperial")
+
+
+def test_unit_system():
+    converter = CSVConverter([], unit_system="metric")
+    lines, stats = convert(converter, HEADER_CSV)
+    assert lines[0] == "Time (hr),Depth (m),Temp [C],Release rate (m^3/hr),Lat (deg)"
+    assert lines[2].split(",")[:3] == ["1.0", "", repr(unit_conversion.convert("Temperature", "F", "C", 212.0))]
+    assert [c.output_name for c in stats.conversions] == lines[0].split(",")[:4]
+
+
+def test_unit_system_explicit_column():
+    # the explicit conversion wins
+    converter = CSVConverter([ColumnConversion("Depth (ft)", None, "ft", "fathoms")], unit_system="SI")
+    lines, stats = convert(converter, HEADER_CSV)
+    assert lines[0].split(",")[1] == "Depth (fathoms)"
+    assert lines[1].split(",")[1] == "1.666666666666667"
+    assert len(stats.conversions) == 3
+
+
+def test_explicit_output_name():
+    assert ColumnConversion.from_spec("Temp [deg F]:F:C").output_name == "Temp [C]"
+    assert ColumnConversion.from_spec("Depth:ft:m").output_name == "Depth"
+    # not a unit of this type
+    assert ColumnConversion("Depth (ft)", "Time", "s", "min").output_name == "Depth (ft)"
+    assert ColumnConversion("Depth (ft)", None, "ft", "m", output_name="D").output_name == "D"
+
+
+def test_cli_explicit_unit_column(tmpdir):
+    infile = tmpdir.join("in.csv")
+    infile.write_binary(HEADER_CSV)
+    outfile = tmpdir.join("out.csv")
+    assert cli.main([str(infile), str(outfile), "-c", "Depth (ft):ft:m", "-q"]) == 0
+    lines = outfile.read_binary().splitlines()
+    assert lines[0].split(b",")[1] == b"Depth (m)"
+    assert lines[1].split(b",")[1] == b"3.048"
+
+
+def test_cli_unit_system(tmpdir):
+    infile = tmpdir.join("in.csv")
+    infile.write_binary(HEADER_CSV)
+    outfile = tmpdir.join("out.csv")
+    assert cli.main([str(infile), str(outfile), "--to", "US", "-q"]) == 0
+    assert outfile.read_binary().splitlines()[0] == b"Time (hr),Depth (ft),Temp [deg F],Release rate (bbl/day),Lat (deg)"
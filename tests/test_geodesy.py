@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+tests for the geodesy module: distances and bearings
+
+designed to be run with pytest:
+
+py.test test_geodesy.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy.unit_conversion import geodesy
+from hazpy.unit_conversion.lat_long import Latitude, Longitude, LatitudeArray, LongitudeArray
+from hazpy.unit_conversion import InvalidUnitError
+
+# Flinders Peak to Buninyong -- the standard test case for Vincenty's formulae
+FLINDERS = (Latitude(-37, 57, 3.72030), Longitude(144, 25, 29.52440))
+BUNINYONG = (Latitude(-37, 39, 10.15610), Longitude(143, 55, 35.38390))
+
+
+def test_latitude_minute():
+    # the sphere is defined so that this is exact
+    assert geodesy.distance(0.0, 0.0, 1 / 60.0, 0.0) == pytest.approx(1852.0, rel=1e-14)
+    assert geodesy.distance(10.0, 20.0, 11.0, 20.0, "nautical miles") == pytest.approx(60.0)
+
+
+def test_units():
+    meters = geodesy.distance(*(FLINDERS + BUNINYONG))
+    assert geodesy.distance(*(FLINDERS + BUNINYONG), unit="km") == pytest.approx(meters / 1000)
+    assert geodesy.distance(*(FLINDERS + BUNINYONG), unit="latitude degree") == pytest.approx(meters / 1852.0 / 60)
+
+
+def test_bad_unit():
+    with pytest.raises(InvalidUnitError):
+        geodesy.distance(0.0, 0.0, 1.0, 1.0, unit="fathoms of grog")
+
+
+def test_vincenty():
+    assert geodesy.distance(*(FLINDERS + BUNINYONG), method="vincenty") == pytest.approx(54972.271, abs=1e-3)
+    assert geodesy.distance(0.0, 0.0, 0.0, 10.0, method="vincenty") == pytest.approx(1113194.908, abs=1e-3)
+    assert geodesy.distance(12.0, 34.0, 12.0, 34.0, method="vincenty") == 0.0
+
+
+def test_vincenty_antipodal():
+    # doesn't converge -- falls back to the sphere
+    d = geodesy.distance(0.0, 0.0, 0.5, 179.7, method="vincenty")
+    assert d == pytest.approx(geodesy.distance(0.0, 0.0, 0.5, 179.7), rel=1e-2)
+
+
+def test_bad_method():
+    with pytest.raises(ValueError):
+        geodesy.distance(0.0, 0.0, 1.0, 1.0, method="flat")
+
+
+def test_bearing():
+    bearings = geodesy.initial_bearing(0.0, 0.0, [1.0, 0.0, -1.0, 0.0], [0.0, 1.0, 0.0, -1.0])
+    assert bearings.tolist() == [0.0, 90.0, 180.0, 270.0]
+    assert geodesy.initial_bearing(*(FLINDERS + BUNINYONG)) == pytest.approx(306.98, abs=0.01)
+
+
+def test_array_inputs():
+    lats = LatitudeArray([-37.95103341666667, 10.0])
+    lons = LongitudeArray([144.42486788888888, 20.0])
+    d = geodesy.distance(lats, lons, BUNINYONG[0], BUNINYONG[1])
+    assert d.shape == (2,)
+    assert d[0] == pytest.approx(geodesy.distance(*(FLINDERS + BUNINYONG)))
+    assert geodesy.distance([Latitude(1.0)], [Longitude(2.0)], 1.0, 2.0).tolist() == [0.0]
+
+
+@pytest.mark.parametrize("method", ["haversine", "vincenty"])
+def test_distance_matrix(method):
+    rng = np.random.RandomState(42)
+    lat1, lon1 = rng.uniform(-80, 80, 30), rng.uniform(-180, 180, 30)
+    lat2, lon2 = rng.uniform(-80, 80, 50), rng.uniform(-180, 180, 50)
+    expected = geodesy.distance(lat1[:, None], lon1[:, None], lat2, lon2, "km", method)
+    # small chunks, so it takes a bunch of blocks, not evenly divided
+    result = geodesy.distance_matrix(lat1, lon1, lat2, lon2, "km", method, chunk_size=170)
+    assert result.shape == (30, 50)
+    assert np.allclose(result, expected, rtol=1e-14)
+
+
+def test_distance_matrix_out():
+    out = np.zeros((2, 3))
+    result = geodesy.distance_matrix([0.0, 1.0], [0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 1.0, 2.0],
+                                     unit="nm", out=out)
+    assert result is out
+    assert out[0].tolist() == pytest.approx([0.0, 60.0, 120.0])
+    with pytest.raises(ValueError):
+        geodesy.distance_matrix([0.0], [0.0], [0.0], [0.0], out=np.zeros((2, 2)))
+
+
+## polygon areas
+def test_octant():
+    # an eighth of the sphere -- with a vertex at the pole
+    area = geodesy.polygon_area([0.0, 0.0, 90.0], [0.0, 90.0, 90.0])
+    assert area == pytest.approx(np.pi * geodesy.EARTH_RADIUS ** 2 / 2, rel=1e-12)
+
+
+def test_small_box():
+    # close to the box bounded by parallels, 1 degree on a side
+    expected = geodesy.EARTH_RADIUS ** 2 * np.radians(1.0) * np.sin(np.radians(1.0))
+    area = geodesy.polygon_area([0.0, 0.0, 1.0, 1.0], [0.0, 1.0, 1.0, 0.0])
+    assert area == pytest.approx(expected, rel=1e-4)
+
+
+def test_direction_and_closing():
+    area = geodesy.polygon_area([28.0, 28.0, 28.1], [-92.0, -91.9, -92.0])
+    assert geodesy.polygon_area([28.1, 28.0, 28.0], [-92.0, -91.9, -92.0]) == pytest.approx(area, rel=1e-12)
+    assert geodesy.polygon_area([28.0, 28.0, 28.1, 28.0], [-92.0, -91.9, -92.0, -92.0]) == pytest.approx(area, rel=1e-12)
+
+
+def test_dateline():
+    area = geodesy.polygon_area([0.0, 0.0, 1.0, 1.0], [179.5, -179.5, -179.5, 179.5])
+    assert area == pytest.approx(geodesy.polygon_area([0.0, 0.0, 1.0, 1.0], [0.0, 1.0, 1.0, 0.0]))
+
+
+def test_area_units():
+    lats, lons = [0.0, 0.0, 1 / 60.0, 1 / 60.0], [0.0, 1 / 60.0, 1 / 60.0, 0.0]
+    assert geodesy.polygon_area(lats, lons, unit="sq nm") == pytest.approx(1.0, rel=1e-6)
+    assert geodesy.polygon_area(lats, lons, unit="sq km") == pytest.approx(1.852 ** 2, rel=1e-6)
+
+
+def test_many_polygons():
+    box_lats, box_lons = [0.0, 0.0, 1.0, 1.0], [0.0, 1.0, 1.0, 0.0]
+    tri_lats, tri_lons = [28.0, 28.0, 28.1], [-92.0, -91.9, -92.0]
+    lats = box_lats + tri_lats + [5.0, 5.0]
+    lons = box_lons + tri_lons + [1.0, 2.0]
+    # the second polygon is empty, the last only has two vertices
+    areas = geodesy.polygon_area(lats, lons, [0, 4, 4, 7], unit="sq km")
+    assert areas.shape == (4,)
+    assert areas[0] == pytest.approx(geodesy.polygon_area(box_lats, box_lons, unit="sq km"), rel=1e-12)
+    assert areas[2] == pytest.approx(geodesy.polygon_area(tri_lats, tri_lons, unit="sq km"), rel=1e-12)
+    assert areas[1] == areas[3] == 0.0
+
+
+def test_bad_offsets():
+    with pytest.raises(ValueError):
+        geodesy.polygon_area([0.0, 0.0, 1.0], [0.0, 1.0, 1.0], [1])
+    with pytest.raises(ValueError):
+        geodesy.polygon_area([0.0, 0.0, 1.0], [0.0, 1.0, 1.0], [0, 2, 1])
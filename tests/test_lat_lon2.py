@@ -97,3 +97,126 @@ def test_format_lon_dms(number, text):
 
 # #     lon = -92.6244444444
 # #     lonf = "92\xb0 37.47\u2032 West"
+
+
+## bulk formatting
+Positions = [28.2186111111, -0.1, -92.6244444444, 0.0, -0.0, 45.05, 179.9999999,
+             -89.99999999999, 30.001, -120.7625, 12.5, -12.5, 0.0083333333333]
+
+def test_format_lat_array():
+    np = pytest.importorskip("numpy")
+    values = np.concatenate([Positions, np.linspace(-90, 90, 2001)])
+    assert ll.format_lat_array(values) == [ll.format_lat(v) for v in values]
+    assert ll.format_lat_array(values, 3) == [ll.format_lat_dms(v) for v in values]
+
+def test_format_lon_array():
+    np = pytest.importorskip("numpy")
+    values = np.concatenate([Positions, np.linspace(-180, 180, 2001)])
+    assert ll.format_lon_array(values) == [ll.format_lon(v) for v in values]
+    assert ll.format_lon_array(values, 3) == [ll.format_lon_dms(v) for v in values]
+
+def test_format_array_style1():
+    pytest.importorskip("numpy")
+    assert ll.format_lat_array([28.2186111111, -0.1], 1) == ["28.22\xb0 North", "0.10\xb0 South"]
+    assert (ll.format_lat_array([-12.345], 1) ==
+            [ll.FORMAT1.format(12.345, ll.LAT_NEGATIVE_DIRECTION)])
+
+def test_format_array_bad_style():
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        ll.format_lat_array([1.0], 4)
+
+def test_write_positions():
+    pytest.importorskip("numpy")
+    import io
+    stream = io.StringIO()
+    ll.write_positions(stream, [28.2186111111, -0.1], [-92.6244444444, 0.5], chunk_size=1)
+    assert stream.getvalue() == ("28\xb0 13.12\u2032 North, 92\xb0 37.47\u2032 West\n"
+                                 "0\xb0 6.00\u2032 South, 0\xb0 30.00\u2032 East\n")
+
+
+## parsing:
+@pytest.mark.parametrize(("text", "number"),
+                         [("28\xb0 13.12\u2032 North", 28.218666666666667),
+                          ("0\xb0 6.00\u2032 South", -0.1),
+                          ("28\xb0 13\u2032 7.00\u2033 North", 28.218611111111112),
+                          ("28.22\xb0 North", 28.22),
+                          ("28\xb0 13.12' North", 28.218666666666667),
+                          ("28\xb0 13' 7.00\" South", -28.218611111111112),
+                          ("28 13 7.2 S", -28.218666666666667),
+                          ("28.2186N", 28.2186),
+                          ("28d 13m 7.2s N", 28.218666666666667),
+                          ("28:13:07.2N", 28.218666666666667),
+                          ("S 28 13.12", -28.218666666666667),
+                          ("-28.5", -28.5),
+                          ])
+def test_parse_lat(text, number):
+    assert ll.parse_lat(text) == pytest.approx(number, abs=1e-12)
+
+
+@pytest.mark.parametrize("number", [28.2186111111, -0.1, -89.99, 0.0])
+def test_parse_lat_round_trip(number):
+    assert ll.parse_lat(ll.format_lat_dms(number)) == pytest.approx(number, abs=1e-5)
+    assert ll.parse_lat(ll.format_lat(number)) == pytest.approx(number, abs=1e-4)
+
+
+def test_parse_lon():
+    assert ll.parse_lon(ll.format_lon(-92.6244444444)) == pytest.approx(-92.6245)
+    assert ll.parse_lon("120 W") == -120.0
+
+
+## a bare "s" at the end: seconds, not South
+@pytest.mark.parametrize(("text", "number"),
+                         [("28d 13m 7.2s", 28.218666666666667),
+                          ("28\xb0 13\u2032 7.2s", 28.218666666666667),
+                          ("28d 13m 7.2s S", -28.218666666666667),
+                          ("S 28d 13m 7.2s", -28.218666666666667),
+                          ("28 13 7.2 S", -28.218666666666667),  # no markers -- South
+                          ("28:13:07.2S", -28.218666666666667),
+                          ])
+def test_parse_lat_seconds_marker(text, number):
+    assert ll.parse_lat(text) == pytest.approx(number, abs=1e-12)
+
+
+@pytest.mark.parametrize(("text", "number"),
+                         [("120d 13m 7.2s", 120.21866666666666),
+                          ("120\xb0 13\u2032 7.2s W", -120.21866666666666),
+                          ("120 13 7.2 s", 120.21866666666666),
+                          ])
+def test_parse_lon_seconds_marker(text, number):
+    assert ll.parse_lon(text) == pytest.approx(number, abs=1e-12)
+
+
+def test_parse_lat_seconds_marker_ambiguous():
+    with pytest.raises(ValueError):
+        ll.parse_lat("28d 13m 7.2 s")
+
+
+@pytest.mark.parametrize("text", ["28 E",          # wrong direction for a latitude
+                                  "-28 S",         # sign and direction
+                                  "N 28 S",        # two directions
+                                  "91 N",          # out of range
+                                  "28 61 N",       # minutes out of range
+                                  "28.5 30 N",     # fractional degrees and minutes
+                                  "north",
+                                  "",
+                                  ])
+def test_parse_lat_invalid(text):
+    with pytest.raises(ValueError):
+        ll.parse_lat(text)
+
+
+def test_parse_lat_array():
+    np = pytest.importorskip("numpy")
+    values, valid = ll.parse_lat_array(["28 13.12 N", "bad", None, "95 S", "0 6 S"])
+    assert valid.tolist() == [True, False, False, False, True]
+    assert np.isnan(values[~valid]).all()
+    assert values[valid] == pytest.approx([28.218666666666667, -0.1])
+
+
+def test_parse_lon_array():
+    pytest.importorskip("numpy")
+    texts = ll.format_lon_array([-92.6244444444, 179.5, 0.25])
+    values, valid = ll.parse_lon_array(texts)
+    assert valid.all()
+    assert values == pytest.approx([-92.6245, 179.5, 0.25], abs=1e-4)
@@ -17,6 +17,16 @@ class testSignBit(unittest.TestCase):
         self.assertTrue(lat_long.signbit(-5))
     def testIntegerPos(self):
         self.assertFalse(lat_long.signbit(5))
+    def testIntegerZero(self):
+        self.assertFalse(lat_long.signbit(0))
+    def testNegInf(self):
+        self.assertTrue(lat_long.signbit(float("-inf")))
+    def testPosInf(self):
+        self.assertFalse(lat_long.signbit(float("inf")))
+    def testSameAsRawBits(self):
+        for value in (-5.0, 5.0, -0.0, 0.0, 1e-320, -1e-320, float("nan"), -float("nan")):
+            self.assertEqual(lat_long.signbit(value),
+                             (lat_long.doubleToRawLongBits(value) >> 63) == 1)
 
 
 class testLatLongErrors(unittest.TestCase):
@@ -248,6 +258,29 @@ class testLongitude(unittest.TestCase):
     def testDirectionSmall(self):
         self.assertEqual(self.L(deg=-.00000000000001).direction(), 'West')
 
+    def testSlots(self):
+        lon = self.L(deg=-120.7625)
+        self.assertRaises(AttributeError, setattr, lon, "something", 1)
+        self.assertFalse(hasattr(lon, "__dict__"))
+
+    def testFromDecimal(self):
+        lon = self.L.from_decimal(-120.7625)
+        self.assertTrue(type(lon) is self.L)
+        self.assertEqual(lon.value, self.L(deg=-120.7625).value)
+        self.assertEqual(self.L.from_decimal(180).value, 180.0)
+
+    def testFromDecimalTooBig(self):
+        self.assertRaises(ValueError, self.L.from_decimal, 185)
+        self.assertRaises(ValueError, self.L.from_decimal, float("nan"))
+
+    def testPickle(self):
+        import pickle
+        for protocol in (0, 1, 2):
+            for value in (-120.7625, 0.0):
+                lon = pickle.loads(pickle.dumps(self.L(deg=value), protocol))
+                self.assertTrue(type(lon) is self.L)
+                self.assertEqual(lon.value, value)
+
     
 
 
@@ -257,3 +290,4 @@ class testLongitude(unittest.TestCase):
 if __name__ == "__main__":
     unittest.main()
 
+
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+"""
+tests for the array (numpy) versions of the lat_long code
+
+designed to be run with pytest:
+
+py.test test_lat_long_arrays.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy.unit_conversion import lat_long
+
+LLC = lat_long.LatLongConverter
+
+DecDegrees = np.concatenate([np.linspace(-180.0, 180.0, 7201),
+                             [45.05, -0.1, -0.0, 0.0, 30.001, -120.7625, 28.2186111111],
+                             ])
+
+
+def check_same(array_result, scalar_results):
+    # exactly the same, including the sign of zero
+    for i, expected in enumerate(scalar_results):
+        for array, value in zip(array_result, expected):
+            assert array[i] == value
+            assert np.signbit(array[i]) == np.signbit(value)
+
+
+def test_to_deg_min():
+    check_same(LLC.ToDegMinArray(DecDegrees), [LLC.ToDegMin(v) for v in DecDegrees])
+
+
+def test_to_deg_min_sec():
+    check_same(LLC.ToDegMinSecArray(DecDegrees), [LLC.ToDegMinSec(v) for v in DecDegrees])
+
+
+def test_minus_zero():
+    degrees, minutes = LLC.ToDegMinArray([-0.1, 0.1])
+
+    assert np.signbit(degrees).tolist() == [True, False]
+    assert np.allclose(minutes, 6.0)
+
+
+def test_binary_problem():
+    degrees, minutes, seconds = LLC.ToDegMinSecArray([45.05])
+
+    assert (degrees[0], minutes[0], seconds[0]) == (45, 3, 0.0)
+
+
+def test_to_dec_deg():
+    d = [30, -0.0, -120, 120.5, 0]
+    m = [30, 20, 45, 0, 30]
+    s = [30, 20, 45, 0, 0]
+    result, valid = LLC.ToDecDegArray(d, m, s)
+
+    assert valid.all()
+    for i in range(len(d)):
+        assert result[i] == LLC.ToDecDeg(d[i], m[i], s[i])
+    assert result[1] == -0.33888888888888885
+
+
+def test_to_dec_deg_broadcast():
+    result, valid = LLC.ToDecDegArray(np.array([10.0, -10.0]), 30)
+
+    assert result.tolist() == [10.5, -10.5]
+
+
+# the same cases as testLatLongErrors
+BadValues = [dict(d=30, m=-30),
+             dict(d=30, m=30, s=-1),
+             dict(d=200),
+             dict(d=-181),
+             dict(d=20, m=61),
+             dict(d=30, m=42, s=61),
+             dict(d=30.2, m=5, s=0),
+             dict(d=30.2, m=0, s=6.3),
+             dict(d=30, m=4.5, s=6),
+             ]
+
+
+@pytest.mark.parametrize("kwargs", BadValues)
+def test_to_dec_deg_invalid(kwargs):
+    with pytest.raises(ValueError) as scalar_error:
+        LLC.ToDecDeg(**kwargs)
+    with pytest.raises(ValueError) as array_error:
+        LLC.ToDecDegArray(strict=True, **kwargs)
+    assert str(array_error.value) == str(scalar_error.value)
+
+    result, valid = LLC.ToDecDegArray(**kwargs)
+    assert not valid
+    assert np.isnan(result)
+
+
+def test_to_dec_deg_mask():
+    d = np.array([30, 30, 200, 45])
+    m = np.array([30, -1, 0, 4.5])
+    s = np.array([0, 0, 0, 6])
+    result, valid = LLC.ToDecDegArray(d, m, s)
+
+    assert valid.tolist() == [True, False, False, False]
+    assert result[0] == 30.5
+    assert np.isnan(result[1:]).all()
+
+
+def test_to_dec_deg_max():
+    result, valid = LLC.ToDecDegArray([95, 85], max=90)
+
+    assert valid.tolist() == [False, True]
+
+
+def test_signbit_array():
+    values = [-5.0, 5.0, -0.0, 0.0, float("-inf"), float("inf"), -1e-320]
+    result = lat_long.signbit_array(values)
+
+    assert result.tolist() == [lat_long.signbit(v) for v in values]
+    assert result.tolist() == [True, False, True, False, True, False, True]
+
+
+## LatitudeArray, LongitudeArray, LatLonArray
+@pytest.mark.parametrize("style", [1, 2, 3])
+def test_latitude_array_format(style):
+    lats = DecDegrees[np.abs(DecDegrees) <= 90.0]
+    expected = [lat_long.Latitude(value).format(style) for value in lats]
+    assert lat_long.LatitudeArray(lats).format(style) == expected
+
+
+@pytest.mark.parametrize("style", [1, 2, 3])
+def test_longitude_array_format(style):
+    expected = [lat_long.Longitude(value).format(style) for value in DecDegrees]
+    assert lat_long.LongitudeArray(DecDegrees).format(style) == expected
+
+
+def test_latitude_array_methods():
+    values = [-120.7625, 45.05, -0.0]
+    lons = lat_long.LongitudeArray(values)
+    for i, value in enumerate(values):
+        lon = lat_long.Longitude(value)
+        assert lons.direction()[i] == lon.direction()
+        for array, expected in zip(lons.degrees_minutes(), lon.degrees_minutes()):
+            assert array[i] == expected
+        for array, expected in zip(lons.degrees_minutes_seconds(), lon.degrees_minutes_seconds()):
+            assert array[i] == expected
+
+
+def test_latitude_array_out_of_range():
+    with pytest.raises(ValueError):
+        lat_long.LatitudeArray([10.0, 90.5])
+    with pytest.raises(ValueError):
+        lat_long.LatitudeArray([np.nan])
+    lat_long.LongitudeArray([10.0, -180.0])
+
+
+def test_latitude_array_indexing():
+    lats = lat_long.LatitudeArray([1.0, -2.0, 3.0])
+    lat = lats[1]
+    assert type(lat) is lat_long.Latitude
+    assert lat.value == -2.0
+    assert type(lats[1:]) is lat_long.LatitudeArray
+    assert lats[1:].values.tolist() == [-2.0, 3.0]
+    assert [lat.value for lat in lats] == [1.0, -2.0, 3.0]
+
+
+def test_latlon_array():
+    positions = lat_long.LatLonArray([28.2186111111, -0.1], [-92.6244444444, 0.5])
+    assert len(positions) == 2
+    assert positions.nbytes == 2 * 16
+    assert positions.format(2) == [u"28\xb0 13.12' North, 92\xb0 37.47' West",
+                                   u"0\xb0 6.00' South, 0\xb0 30.00' East"]
+    lat, lon = positions[1]
+    assert (lat.value, lon.value) == (-0.1, 0.5)
+    assert positions.direction()[1].tolist() == ["West", "East"]
+
+
+def test_latlon_array_lengths():
+    with pytest.raises(ValueError):
+        lat_long.LatLonArray([1.0, 2.0], [3.0])
+
+
+def test_from_array():
+    lats = lat_long.Latitude.from_array([-89.5, 0.0, 28.2186111111])
+    assert [type(lat) for lat in lats] == [lat_long.Latitude] * 3
+    assert [lat.value for lat in lats] == [-89.5, 0.0, 28.2186111111]
+    assert lats[2].format(2) == lat_long.Latitude(28.2186111111).format(2)
+
+
+def test_from_array_out_of_range():
+    with pytest.raises(ValueError):
+        lat_long.Latitude.from_array([0.0, -90.5])
+    assert len(lat_long.Longitude.from_array(np.array([-90.5, 180.0]))) == 2
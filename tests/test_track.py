@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""
+tests for the track module: distance, heading, speed along a track
+
+designed to be run with pytest:
+
+py.test test_track.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hazpy.unit_conversion import track
+from hazpy.unit_conversion.unit_conversion import convert
+
+
+def test_track_segments():
+    # one nautical mile North, then about one East, an hour each
+    distance, heading, speed = track.track_segments([0.0, 1.0, 2.0],
+                                                    [0.0, 1 / 60.0, 1 / 60.0],
+                                                    [0.0, 0.0, 1 / 60.0],
+                                                    distance_unit="nm",
+                                                    speed_unit="m/s",
+                                                    time_unit="hours")
+    assert distance == pytest.approx([1.0, 1.0])
+    assert heading == pytest.approx([0.0, 90.0], abs=1e-5)
+    assert speed == pytest.approx([1852.0 / 3600] * 2)
+
+
+def test_speed_units():
+    args = ([0.0, 100.0], [10.0, 10.01], [20.0, 20.01])
+    mps = track.track_segments(*args)[2]
+    knots = track.track_segments(*args, speed_unit="knots")[2]
+    assert knots[0] == pytest.approx(convert("Velocity", "m/s", "knots", mps[0]))
+
+
+def test_datetime64():
+    times = np.array(["2020-01-01T00:00", "2020-01-01T00:30", "2020-01-01T00:30"],
+                     dtype="datetime64[ns]")
+    distance, heading, speed = track.track_segments(times, [0.0, 0.0, 0.0], [0.0, 0.5 / 60, 1 / 60.0],
+                                                    distance_unit="nm", speed_unit="knots")
+    assert speed[0] == pytest.approx(convert("Velocity", "m/s", "knots", 926.0 / 1800))
+    # no time between the last two points
+    assert np.isnan(speed[1])
+
+
+def test_lengths_mismatch():
+    with pytest.raises(ValueError):
+        track.track_segments([0.0, 1.0], [0.0, 1.0], [0.0])
+
+
+def test_analyzer_chunks():
+    rng = np.random.RandomState(1)
+    n = 1000
+    times = np.cumsum(rng.uniform(1, 100, n))
+    lats = 28.0 + np.cumsum(rng.normal(0, 0.01, n))
+    lons = -92.0 + np.cumsum(rng.normal(0, 0.01, n))
+    expected = track.track_segments(times, lats, lons, "km", "cm/s")
+
+    analyzer = track.TrackAnalyzer("km", "cm/s")
+    results = [analyzer.process(times[i:i + 137], lats[i:i + 137], lons[i:i + 137])
+               for i in range(0, n, 137)]
+    for i in range(3):
+        assert np.allclose(np.concatenate([r[i] for r in results]), expected[i], rtol=1e-14)
+    assert analyzer.total_distance == pytest.approx(expected[0].sum())
+
+    analyzer.reset()
+    assert len(analyzer.process(times[:10], lats[:10], lons[:10])[0]) == 9
+
+
+def test_analyzer_empty_chunk():
+    analyzer = track.TrackAnalyzer()
+    analyzer.process([0.0], [0.0], [0.0])
+    assert len(analyzer.process([], [], [])[0]) == 0
+    assert analyzer.process([10.0], [0.0], [1 / 60.0])[0] == pytest.approx([1852.0])
@@ -229,6 +229,37 @@ class testOilQuantityConverterClass(unittest.TestCase):
                                      MassUnits="longton")
         self.failUnless(Close(Expected, Calculated))
 
+class testSlickVolumeConverterClass(unittest.TestCase):
+    SVC = unit_conversion.SlickVolumeConverter
+
+    def testToVolume1(self):
+        # a micron over a square km is a cubic meter
+        self.failUnless(Close(self.SVC.ToVolume(Thickness=1,
+                                                ThicknessUnits="micron",
+                                                Area=1,
+                                                AreaUnits="sq km",
+                                                VolumeUnits="m^3"),
+                              1.0)
+                        )
+
+    def testToVolume2(self):
+        Expected = unit_conversion.convert("Volume", "m^3", "bbl", 10.0)
+        Calculated = self.SVC.ToVolume(Thickness=1,
+                                       ThicknessUnits="mm",
+                                       Area=1,
+                                       AreaUnits="hectare",
+                                       VolumeUnits="bbl")
+        self.failUnless(Close(Expected, Calculated))
+
+    def testToThickness(self):
+        Expected = 0.1
+        Calculated = self.SVC.ToThickness(Volume=1.0,
+                                          VolumeUnits="liter",
+                                          Area=1.0,
+                                          AreaUnits="hectare",
+                                          ThicknessUnits="micron")
+        self.failUnless(Close(Expected, Calculated))
+
 def test_GetUnitTypes():
     ## note: not testing all of them
     types = unit_conversion.GetUnitTypes()
@@ -308,3 +339,174 @@ def test_invalid_unit_convert():
         unit_conversion.convert("temperature", "f", "feet", 1.0)
 
 
+
+
+## the conversion handles
+
+def test_get_converter_known_values():
+    for Type, From, To, Value, Expected in KnownValues:
+        handle = unit_conversion.get_converter(Type, From, To)
+        assert Close(handle(Value), Expected)
+
+def test_temperature_scalar_exact():
+    # the original arithmetic -- these come out exactly
+    assert unit_conversion.convert("Temperature", "C", "F", 0.0) == 32.0
+    assert unit_conversion.convert("Temperature", "C", "F", -40.0) == -40.0
+    assert unit_conversion.convert("Temperature", "K", "F", 273.16) == 32.0
+
+def test_get_converter_matches_convert():
+    from hazpy.unit_conversion.unit_data import ConvertDataUnits
+    for unit_type, units in ConvertDataUnits.items():
+        for From in units:
+            for To in units:
+                handle = unit_conversion.get_converter(unit_type, From, To)
+                for Value in (0.5, 1.0, 25.7222, 1234.5):
+                    assert Close(handle(Value),
+                                 unit_conversion.convert(unit_type, From, To, Value),
+                                 1e-14)
+
+def test_get_converter_cached():
+    handle1 = unit_conversion.get_converter("Length", "feet", "meters")
+    handle2 = unit_conversion.get_converter("Length", "feet", "meters")
+    handle3 = unit_conversion.get_converter("length", "ft", "m")
+    assert handle1 is handle2
+    assert handle1 is handle3
+
+def test_get_converter_hashable():
+    handle1 = unit_conversion.get_converter("Length", "feet", "meters")
+    handle2 = unit_conversion.Converters["length"].GetConverter("ft", "m")
+    assert handle1 is not handle2
+    assert handle1 == handle2
+    assert hash(handle1) == hash(handle2)
+    assert handle1 != unit_conversion.get_converter("Length", "meters", "feet")
+    assert len(set([handle1, handle2])) == 1
+
+def test_get_converter_coefficients():
+    factor, = unit_conversion.get_converter("Length", "feet", "inches").coefficients
+    assert Close(factor, 12.0)
+    from_scale, from_offset, to_scale, to_offset = unit_conversion.get_converter("Temperature", "C", "F").coefficients
+    assert (from_scale, from_offset) == (1.0, 273.16)
+    assert Close(to_scale, 5.0 / 9.0)
+    factor, from_api, to_api = unit_conversion.get_converter("Density", "API", "SG").coefficients
+    assert (factor, from_api, to_api) == (1.0, True, False)
+
+def test_unit_converter_is_abstract():
+    with pytest.raises(TypeError):
+        unit_conversion.UnitConverter("Length", "foot", "meter")
+
+def test_get_converter_bad_names():
+    with pytest.raises(unit_conversion.InvalidUnitTypeError):
+        unit_conversion.get_converter("BadType", "feet", "miles")
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.get_converter("Length", "feet", "spam")
+
+
+## the unit name index
+
+def test_FindUnitTypes_excluded():
+    all_units = unit_conversion.FindUnitTypes()
+    assert 'bbl/acre' not in all_units # Oil Concentration
+    assert 'ppm' not in all_units # Concentration In Water
+    assert all_units['oz'] == 'Mass'
+
+def test_FindUnitTypes_copy():
+    all_units = unit_conversion.FindUnitTypes()
+    all_units['s'] = 'Spam'
+    assert unit_conversion.FindUnitTypes()['s'] == 'Time'
+
+def test_unit_index_built_once():
+    assert unit_conversion.get_unit_index() is unit_conversion.get_unit_index()
+
+def test_unit_index_duplicates():
+    data = {"Length": {"meter": (1.0, ["m"]),
+                       "mile": (1609.344, ["m"])},
+            }
+    with pytest.raises(ValueError):
+        unit_conversion.UnitIndex(data)
+
+def test_validate_unit_names():
+    unit_conversion.validate_unit_names()
+
+def test_find_unit_type():
+    assert unit_conversion.find_unit_type('feet') == 'Length'
+    assert unit_conversion.find_unit_type('S') == 'Density'
+    assert unit_conversion.find_unit_type('s') == 'Time'
+    assert unit_conversion.find_unit_type('Deg F') == 'Temperature'
+    assert unit_conversion.find_unit_type('Cubic Meters') == 'Volume'
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.find_unit_type('flintstones')
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.find_unit_type('bbl/acre')
+
+def test_canonical_unit_name():
+    assert unit_conversion.canonical_unit_name('ft') == 'foot'
+    assert unit_conversion.canonical_unit_name('knot') == 'knot'
+    assert unit_conversion.canonical_unit_name('degrees c') == 'Celsius'
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.canonical_unit_name('flintstones')
+
+def test_unit_index_contains():
+    index = unit_conversion.get_unit_index()
+    assert 'kts' in index
+    assert 'KTS' in index
+    assert 'flintstones' not in index
+    assert None not in index
+
+
+## lazy loading
+
+def test_import_does_not_load_numpy():
+    import subprocess
+    code = ("import sys; import hazpy.unit_conversion as uc; "
+            "uc.convert('Length', 'ft', 'm', 1.0); "
+            "print('numpy' in sys.modules)")
+    output = subprocess.check_output([sys.executable, "-c", code],
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.strip() == b"False"
+
+def test_converters_lazy():
+    from hazpy.unit_conversion.unit_data import ConvertDataUnits
+    Converters = unit_conversion.Converters
+    assert "length" in Converters
+    assert "spam" not in Converters
+    assert Converters.get("spam") is None
+    assert len(Converters) == len(ConvertDataUnits)
+    assert sorted([c.Name for c in Converters.values()]) == sorted(ConvertDataUnits.keys())
+    assert isinstance(Converters["temperature"], unit_conversion.TempConverterClass)
+    assert isinstance(Converters["density"], unit_conversion.DensityConverterClass)
+    with pytest.raises(KeyError):
+        Converters["spam"]
+
+def test_lazy_module_attributes():
+    # the stand-in doesn't hide any of numpy's names
+    numpy = pytest.importorskip("numpy")
+    from hazpy.unit_conversion import _lazy
+    assert _lazy.np.load is numpy.load
+    assert _lazy.available(_lazy.np)
+    assert not _lazy.available(_lazy.LazyModule("no_such_module_here"))
+
+
+## the conversion tables
+
+def test_unit_ids_stable():
+    Converter = unit_conversion.Converters["length"]
+    assert Converter.UnitNames == sorted(Converter.UnitNames)
+    assert Converter.UnitID("m") == Converter.UnitNames.index("meter")
+    assert Converter.UnitID("Feet") == Converter.UnitNames.index("foot")
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        Converter.UnitID("spam")
+
+def test_factor_table():
+    Converter = unit_conversion.Converters["volume"]
+    bbl = Converter.UnitID("bbl")
+    gal = Converter.UnitID("gal")
+    assert Close(Converter.Factors[bbl][gal], 42.0)
+    assert Close(Converter.Factors[gal][bbl], 1.0 / 42.0)
+    assert Converter.Factors[bbl][bbl] == 1.0
+
+def test_affine_tables():
+    Converter = unit_conversion.Converters["temperature"]
+    C = Converter.UnitID("C")
+    F = Converter.UnitID("F")
+    assert Close(Converter.Scales[C][F], 1.8)
+    assert Close(Converter.Offsets[C][F], 32.0)